@@ -1,28 +1,36 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.models import Priority, Task, TaskManager
-from app.utils import get_tag_for_task, compare_and_update_priority
+from app.models import BaseTaskManager, Priority, Task, TaskOrder
+from app.utils import (
+    compare_and_update_priority,
+    get_tag_async,
+    get_tag_for_task,
+    get_tags_for_tasks_async,
+    retag_tasks,
+    roll_over_tags,
+)
 
 
-def get_all_tasks(task_manager: TaskManager) -> List[Task]:
+def get_all_tasks(task_manager: BaseTaskManager) -> List[Task]:
 
     return task_manager.list_tasks()
 
 
-def get_task_by_id(task_manager: TaskManager, task_id: int) -> Optional[Task]:
+def get_task_by_id(task_manager: BaseTaskManager, task_id: int) -> Optional[Task]:
 
     return task_manager.get_task(task_id)
 
 
 def create_task(
-    task_manager: TaskManager,
+    task_manager: BaseTaskManager,
     title: str,
     description: str,
     due_date: datetime,
     priority: Priority,
     completed: bool = False,
     get_tag: bool = True,
+    tag: Optional[str] = None,
 ) -> Task:
 
     task = task_manager.add_task(
@@ -31,7 +39,7 @@ def create_task(
         due_date=due_date,
         priority=priority,
         completed=completed,
-        tag=None,
+        tag=tag,
     )
 
     if get_tag:
@@ -42,13 +50,34 @@ def create_task(
             due_date=task.due_date,
             priority=task.priority,
         )
-        task.tag = tag
+        task = task_manager.update_task(task.id, tag=tag)
 
     return task
 
 
+async def get_tags_async(tasks: List[Tuple[datetime, Priority]]) -> List[Optional[str]]:
+
+    if len(tasks) == 1:
+        due_date, priority = tasks[0]
+        return [await get_tag_async(due_date, priority)]
+
+    return await get_tags_for_tasks_async(tasks)
+
+
+def tag_key(
+    task: Task,
+    due_date: Optional[datetime] = None,
+    priority: Optional[Priority] = None,
+) -> Tuple[datetime, Priority]:
+
+    return (
+        due_date if due_date is not None else task.due_date,
+        priority if priority is not None else task.priority,
+    )
+
+
 def update_task(
-    task_manager: TaskManager,
+    task_manager: BaseTaskManager,
     task_id: int,
     title: Optional[str] = None,
     description: Optional[str] = None,
@@ -56,19 +85,21 @@ def update_task(
     priority: Optional[Priority] = None,
     completed: Optional[bool] = None,
     get_tag: bool = True,
+    tag: Optional[str] = None,
 ) -> Optional[Task]:
 
     task = task_manager.get_task(task_id)
     if not task:
         return None
 
-    task_manager.update_task(
+    task = task_manager.update_task(
         task_id=task_id,
         title=title,
         description=description,
         due_date=due_date,
         priority=priority,
         completed=completed,
+        tag=tag,
     )
 
     if get_tag and due_date is not None:
@@ -85,37 +116,37 @@ def update_task(
             priority=updated_prio,
         )
 
-        task.tag = tag
+        task = task_manager.update_task(task_id, tag=tag)
 
     return task
 
 
-def delete_task(task_manager: TaskManager, task_id: int) -> bool:
+def delete_task(task_manager: BaseTaskManager, task_id: int) -> bool:
 
     return task_manager.delete_task(task_id)
 
 
 def mark_tasks_as_complete(
-    task_manager: TaskManager, task_ids: List[int]
+    task_manager: BaseTaskManager, task_ids: List[int]
 ) -> List[Task]:
 
     return task_manager.mark_tasks_complete(task_ids)
 
 
 def mark_tasks_as_incomplete(
-    task_manager: TaskManager, task_ids: List[int]
+    task_manager: BaseTaskManager, task_ids: List[int]
 ) -> List[Task]:
 
     return task_manager.mark_tasks_incomplete(task_ids)
 
 
-def delete_multiple_tasks(task_manager: TaskManager, task_ids: List[int]) -> int:
+def delete_multiple_tasks(task_manager: BaseTaskManager, task_ids: List[int]) -> int:
 
     return task_manager.delete_tasks(task_ids)
 
 
 def filter_tasks(
-    task_manager: TaskManager,
+    task_manager: BaseTaskManager,
     completed: Optional[bool] = None,
     priority: Optional[Priority] = None,
 ) -> List[Task]:
@@ -123,8 +154,45 @@ def filter_tasks(
     return task_manager.filter_tasks(completed=completed, priority=priority)
 
 
+def count_tasks(
+    task_manager: BaseTaskManager, completed: Optional[bool] = None
+) -> Dict[str, Any]:
+
+    return task_manager.count_tasks(completed=completed)
+
+
+def page_tasks(
+    task_manager: BaseTaskManager,
+    completed: Optional[bool] = None,
+    priority: Optional[Priority] = None,
+    order_by: TaskOrder = TaskOrder.ID,
+    after: Optional[Any] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[Task], Optional[Any]]:
+
+    return task_manager.page_tasks(
+        completed=completed,
+        priority=priority,
+        order_by=order_by,
+        after=after,
+        limit=limit,
+    )
+
+
 def update_priorities_by_due_date(
-    task_manager: TaskManager, reference_date: datetime, new_priority: Priority
+    task_manager: BaseTaskManager, reference_date: datetime, new_priority: Priority
 ) -> List[Task]:
 
     return compare_and_update_priority(task_manager, reference_date, new_priority)
+
+
+def retag_all_tasks(task_manager: BaseTaskManager, today: Optional[date] = None) -> int:
+
+    return retag_tasks(task_manager, today)
+
+
+def roll_over_task_tags(
+    task_manager: BaseTaskManager, today: Optional[date] = None
+) -> int:
+
+    return roll_over_tags(task_manager, today)
@@ -0,0 +1,53 @@
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def configure_logging(
+    level: str = LOG_LEVEL, stream: Optional[TextIO] = None
+) -> logging.Logger:
+
+    global _listener, _queue_handler
+
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+
+    if _listener is None:
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        _queue_handler = QueueHandler(log_queue)
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+
+        logger.addHandler(_queue_handler)
+        logger.propagate = False
+
+    return logger
+
+
+def shutdown_logging() -> None:
+
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+
+    logger = logging.getLogger("app")
+    logger.removeHandler(_queue_handler)
+    logger.propagate = True
+
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
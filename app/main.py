@@ -1,13 +1,26 @@
+import asyncio
+import logging
 import os
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Path, Query
+from fastapi import Depends, FastAPI, HTTPException, Path, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app import crud
-from app.models import Priority, TaskManager
+from app.logging_config import configure_logging, shutdown_logging
+from app.metrics import REQUEST_LATENCY, STAGE_LATENCY, registry
+from app.models import BaseTaskManager, Priority, Task, TaskOrder
+from app.profiling import (
+    PROFILE_NOTE,
+    PROFILING_ENABLED,
+    ProfileBuffer,
+    ProfilingMiddleware,
+)
 from app.schemas import (
     BulkTaskIdsRequest,
     TaskCreate,
@@ -16,15 +29,54 @@ from app.schemas import (
     TaskUpdate,
     TaskBatchCreate,
 )
-from app.utils import load_tasks_from_file, save_tasks_to_file, get_tag_for_task
+from app.serialization import (
+    NDJSON_MEDIA_TYPE,
+    stream_tasks_ndjson,
+    task_list_response,
+    task_page_response,
+    task_response,
+)
+from app.storage import create_storage
+from app.utils import decode_cursor, encode_cursor, tag_cache, tag_service_session
+from tag_server.metrics import CONTENT_TYPE, Counter, Gauge, MetricsMiddleware
 
-TASKS_FILE = os.path.join(os.path.dirname(__file__), "data", "tasks.json")
+TASKS_FILE = os.environ.get(
+    "TASKS_FILE", os.path.join(os.path.dirname(__file__), "data", "tasks.json")
+)
+TASKS_DB_FILE = os.environ.get(
+    "TASKS_DB_FILE", os.path.join(os.path.dirname(__file__), "data", "tasks.db")
+)
+TASK_STORAGE_BACKEND = os.environ.get("TASK_STORAGE_BACKEND", "json")
 TAG_SERVICE_URL = "http://localhost:8001/tag"
 
+task_storage = create_storage(TASK_STORAGE_BACKEND, TASKS_FILE, TASKS_DB_FILE)
+update_lock = asyncio.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+
+    configure_logging()
+    task_storage.load()
+    tag_rollover = asyncio.create_task(run_tag_rollover())
+    yield
+    tag_rollover.cancel()
+    try:
+        await tag_rollover
+    except asyncio.CancelledError:
+        pass
+    task_storage.close()
+    tag_service_session.close()
+    shutdown_logging()
+
+
 app = FastAPI(
     title="Smart Task Manager API",
     description="API for managing tasks in the Smart Task Manager application. Requires the tagger server running on port 8001.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -34,16 +86,137 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, histogram=REQUEST_LATENCY)
+
+request_profiles = ProfileBuffer()
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, profiles=request_profiles)
+
+
+def get_task_manager() -> BaseTaskManager:
+
+    return task_storage.get_task_manager()
+
+
+@asynccontextmanager
+async def locked_task_manager():
+
+    async with update_lock:
+        lock = task_storage.write_lock()
+        acquiring = asyncio.ensure_future(run_in_threadpool(lock.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+
+            def release_once_acquired(future: asyncio.Future) -> None:
+
+                if not future.cancelled() and future.exception() is None:
+                    lock.release()
+
+            acquiring.add_done_callback(release_once_acquired)
+            raise
+
+        try:
+            yield task_storage.get_task_manager()
+        finally:
+            lock.release()
+
+
+async def get_task_manager_for_update():
+
+    async with locked_task_manager() as task_manager:
+        yield task_manager
+
+
+def get_existing_task(task_manager: BaseTaskManager, task_id: int) -> Task:
+
+    task = crud.get_task_by_id(task_manager, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
+    return task
+
+
+def save_tasks(task_manager: BaseTaskManager) -> None:
+
+    with STAGE_LATENCY.time("storage_save"):
+        task_storage.save(task_manager)
+
+
+def task_count_samples():
+
+    counts = task_storage.get_task_manager().completion_counts()
+    return {(str(completed).lower(),): count for completed, count in counts.items()}
+
+
+registry.register(
+    Gauge(
+        "task_manager_tasks",
+        "Tasks in storage by completion status",
+        ("completed",),
+        callback=task_count_samples,
+    )
+)
+registry.register(
+    Counter(
+        "task_manager_tag_cache_hits_total",
+        "Tag cache lookups answered from the cache",
+        callback=lambda: tag_cache.stats()["hits"],
+    )
+)
+registry.register(
+    Counter(
+        "task_manager_tag_cache_misses_total",
+        "Tag cache lookups that missed the cache",
+        callback=lambda: tag_cache.stats()["misses"],
+    )
+)
+registry.register(
+    Gauge(
+        "task_manager_tag_cache_hit_ratio",
+        "Fraction of tag cache lookups answered from the cache",
+        callback=lambda: tag_cache.stats()["hit_ratio"],
+    )
+)
+registry.register(
+    Gauge(
+        "task_manager_tag_cache_size",
+        "Entries held in the tag cache",
+        callback=lambda: tag_cache.stats()["size"],
+    )
+)
+
 
+async def refresh_tags(today: date, full: bool) -> None:
 
-def get_task_manager() -> TaskManager:
+    try:
+        async with locked_task_manager() as task_manager:
+            if full:
+                retagged_count = crud.retag_all_tasks(task_manager, today)
+            else:
+                retagged_count = crud.roll_over_task_tags(task_manager, today)
 
-    return load_tasks_from_file(TASKS_FILE)
+            if retagged_count:
+                save_tasks(task_manager)
+    except Exception:
+        logger.exception("Error refreshing tags for %s", today)
 
 
-def save_tasks(task_manager: TaskManager) -> None:
+async def run_tag_rollover() -> None:
 
-    save_tasks_to_file(task_manager, TASKS_FILE)
+    last_day = datetime.now().date()
+    await refresh_tags(last_day, full=True)
+
+    while True:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        await asyncio.sleep((midnight - now).total_seconds())
+
+        today = datetime.now().date()
+        if today == last_day:
+            continue
+
+        await refresh_tags(today, full=(today - last_day).days != 1)
+        last_day = today
 
 
 class TaggerRequest(BaseModel):
@@ -61,127 +234,140 @@ async def root():
 
 
 @app.post("/tasks", response_model=TaskResponse, tags=["Tasks"])
-async def create_task(
-    task: TaskCreate, task_manager: TaskManager = Depends(get_task_manager)
-):
+async def create_task(task: TaskCreate):
 
-    created_task = crud.create_task(
-        task_manager=task_manager,
-        title=task.title,
-        description=task.description,
-        due_date=task.due_date,
-        priority=task.priority,
-        completed=task.completed,
-    )
+    tags = await crud.get_tags_async([(task.due_date, task.priority)])
 
-    save_tasks(task_manager)
+    async with locked_task_manager() as task_manager:
+        created_task = crud.create_task(
+            task_manager=task_manager,
+            title=task.title,
+            description=task.description,
+            due_date=task.due_date,
+            priority=task.priority,
+            completed=task.completed,
+            get_tag=False,
+            tag=tags[0],
+        )
 
-    tag = created_task.tag if created_task.tag is not None else ""
+        save_tasks(task_manager)
 
-    return TaskResponse(
-        id=created_task.id,
-        title=created_task.title,
-        description=created_task.description,
-        due_date=created_task.due_date,
-        priority=created_task.priority,
-        completed=created_task.completed,
-        tag=tag,
-    )
+    return task_response(created_task)
 
 
 @app.get("/tasks", response_model=TaskListResponse, tags=["Tasks"])
 async def get_tasks(
+    request: Request,
     completed: Optional[bool] = Query(None, description="Filter by completion status"),
     priority: Optional[Priority] = Query(None, description="Filter by priority level"),
-    task_manager: TaskManager = Depends(get_task_manager),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum tasks per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    order_by: TaskOrder = Query(TaskOrder.ID, description="Page ordering"),
+    task_manager: BaseTaskManager = Depends(get_task_manager),
 ):
 
-    tasks = crud.filter_tasks(
-        task_manager=task_manager, completed=completed, priority=priority
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_tasks_ndjson(task_manager, completed=completed, priority=priority),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, order_by)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    tasks, last_key = crud.page_tasks(
+        task_manager=task_manager,
+        completed=completed,
+        priority=priority,
+        order_by=order_by,
+        after=after,
+        limit=limit,
     )
+    next_cursor = encode_cursor(order_by, last_key) if last_key is not None else None
 
-    task_responses = []
-    for task in tasks:
+    return task_page_response(tasks, next_cursor=next_cursor)
 
-        tag = task.tag if task.tag is not None else ""
 
-        task_responses.append(
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                due_date=task.due_date,
-                priority=task.priority,
-                completed=task.completed,
-                tag=tag,
-            )
-        )
+@app.get("/tasks/stream", tags=["Tasks"])
+async def stream_tasks(
+    completed: Optional[bool] = Query(None, description="Filter by completion status"),
+    priority: Optional[Priority] = Query(None, description="Filter by priority level"),
+    task_manager: BaseTaskManager = Depends(get_task_manager),
+):
 
-    return TaskListResponse(tasks=task_responses, count=len(task_responses))
+    return StreamingResponse(
+        stream_tasks_ndjson(task_manager, completed=completed, priority=priority),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@app.get("/tasks/stats", tags=["Tasks"])
+async def get_task_stats(
+    completed: Optional[bool] = Query(None, description="Filter by completion status"),
+    task_manager: BaseTaskManager = Depends(get_task_manager),
+):
+
+    return crud.count_tasks(task_manager, completed=completed)
 
 
 @app.get("/tasks/{task_id}", response_model=TaskResponse, tags=["Tasks"])
 async def get_task(
     task_id: int = Path(..., description="ID of the task to retrieve"),
-    task_manager: TaskManager = Depends(get_task_manager),
+    task_manager: BaseTaskManager = Depends(get_task_manager),
 ):
 
     task = crud.get_task_by_id(task_manager, task_id)
     if task is None:
         raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
 
-    tag = task.tag if task.tag is not None else ""
-
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        due_date=task.due_date,
-        priority=task.priority,
-        completed=task.completed,
-        tag=tag,
-    )
+    return task_response(task)
 
 
 @app.put("/tasks/{task_id}", response_model=TaskResponse, tags=["Tasks"])
 async def update_task(
     task_update: TaskUpdate,
     task_id: int = Path(..., description="ID of the task to update"),
-    task_manager: TaskManager = Depends(get_task_manager),
 ):
 
-    updated_task = crud.update_task(
-        task_manager=task_manager,
-        task_id=task_id,
-        title=task_update.title,
-        description=task_update.description,
-        due_date=task_update.due_date,
-        priority=task_update.priority,
-        completed=task_update.completed,
-    )
-
-    if updated_task is None:
-        raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
-
-    save_tasks(task_manager)
+    while True:
+        key = tag = None
+        if task_update.due_date is not None:
+            task = get_existing_task(get_task_manager(), task_id)
+            key = crud.tag_key(task, task_update.due_date, task_update.priority)
+            tag = (await crud.get_tags_async([key]))[0]
+
+        async with locked_task_manager() as task_manager:
+            task = get_existing_task(task_manager, task_id)
+            if key is not None and key != crud.tag_key(
+                task, task_update.due_date, task_update.priority
+            ):
+                continue
+
+            updated_task = crud.update_task(
+                task_manager=task_manager,
+                task_id=task_id,
+                title=task_update.title,
+                description=task_update.description,
+                due_date=task_update.due_date,
+                priority=task_update.priority,
+                completed=task_update.completed,
+                get_tag=False,
+                tag=tag,
+            )
 
-    tag = updated_task.tag if updated_task.tag is not None else ""
+            save_tasks(task_manager)
 
-    return TaskResponse(
-        id=updated_task.id,
-        title=updated_task.title,
-        description=updated_task.description,
-        due_date=updated_task.due_date,
-        priority=updated_task.priority,
-        completed=updated_task.completed,
-        tag=tag,
-    )
+        return task_response(updated_task)
 
 
 @app.delete("/tasks/{task_id}", tags=["Tasks"])
 async def delete_task(
     task_id: int = Path(..., description="ID of the task to delete"),
-    task_manager: TaskManager = Depends(get_task_manager),
+    task_manager: BaseTaskManager = Depends(get_task_manager_for_update),
 ):
 
     success = crud.delete_task(task_manager, task_id)
@@ -198,157 +384,158 @@ async def delete_task(
     "/tasks/complete", response_model=List[TaskResponse], tags=["Bulk Operations"]
 )
 async def complete_tasks(
-    request: BulkTaskIdsRequest, task_manager: TaskManager = Depends(get_task_manager)
+    request: BulkTaskIdsRequest,
+    task_manager: BaseTaskManager = Depends(get_task_manager_for_update),
 ):
 
     updated_tasks = crud.mark_tasks_as_complete(task_manager, request.task_ids)
 
     save_tasks(task_manager)
 
-    response_tasks = []
-    for task in updated_tasks:
-
-        tag = task.tag if task.tag is not None else ""
-
-        response_tasks.append(
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                due_date=task.due_date,
-                priority=task.priority,
-                completed=task.completed,
-                tag=tag,
-            )
-        )
-
-    return response_tasks
+    return task_list_response(updated_tasks)
 
 
 @app.post(
     "/tasks/incomplete", response_model=List[TaskResponse], tags=["Bulk Operations"]
 )
 async def incomplete_tasks(
-    request: BulkTaskIdsRequest, task_manager: TaskManager = Depends(get_task_manager)
+    request: BulkTaskIdsRequest,
+    task_manager: BaseTaskManager = Depends(get_task_manager_for_update),
 ):
 
     updated_tasks = crud.mark_tasks_as_incomplete(task_manager, request.task_ids)
 
     save_tasks(task_manager)
 
-    response_tasks = []
-    for task in updated_tasks:
-
-        tag = task.tag if task.tag is not None else ""
-
-        response_tasks.append(
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                due_date=task.due_date,
-                priority=task.priority,
-                completed=task.completed,
-                tag=tag,
-            )
-        )
-
-    return response_tasks
+    return task_list_response(updated_tasks)
 
 
 @app.post("/tasks/delete", tags=["Bulk Operations"])
 async def delete_tasks(
-    request: BulkTaskIdsRequest, task_manager: TaskManager = Depends(get_task_manager)
+    request: BulkTaskIdsRequest,
+    task_manager: BaseTaskManager = Depends(get_task_manager_for_update),
 ):
 
     deleted_count = crud.delete_multiple_tasks(task_manager, request.task_ids)
 
     save_tasks(task_manager)
 
-    return {"message": f"Deleted {deleted_count} tasks"}
+    return {"message": f"Deleted {deleted_count} tasks", "deleted": deleted_count}
 
 
-@app.post("/tagger", response_model=TaskResponse, tags=["Tagger"])
-async def update_task_tag(
-    tagger_request: TaggerRequest, task_manager: TaskManager = Depends(get_task_manager)
+@app.post("/tasks/retag", tags=["Bulk Operations"])
+async def retag_tasks(
+    task_manager: BaseTaskManager = Depends(get_task_manager_for_update),
 ):
 
-    print(f"DEBUG: update_task_tag called with task_id={tagger_request.task_id}")
+    retagged_count = crud.retag_all_tasks(task_manager)
 
-    task = crud.get_task_by_id(task_manager, tagger_request.task_id)
-    if task is None:
-        raise HTTPException(
-            status_code=404, detail=f"Task with ID {tagger_request.task_id} not found"
-        )
+    if retagged_count:
+        save_tasks(task_manager)
 
-    tag = get_tag_for_task(
-        task_id=task.id,
-        title=task.title,
-        description=task.description,
-        due_date=task.due_date,
-        priority=task.priority,
-    )
+    return {
+        "message": f"Retagged {retagged_count} tasks",
+        "retagged": retagged_count,
+    }
 
-    task.tag = tag
-    print(f"DEBUG: Updated task (id={task.id}) tag to '{tag}'")
 
-    save_tasks(task_manager)
+@app.post("/tagger", response_model=TaskResponse, tags=["Tagger"])
+async def update_task_tag(tagger_request: TaggerRequest):
 
-    tag = task.tag if task.tag is not None else ""
+    task_id = tagger_request.task_id
+    logger.debug("update_task_tag called with task_id=%s", task_id)
 
-    response_task = TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        due_date=task.due_date,
-        priority=task.priority,
-        completed=task.completed,
-        tag=tag,
-    )
+    while True:
+        key = crud.tag_key(get_existing_task(get_task_manager(), task_id))
+        tag = (await crud.get_tags_async([key]))[0]
 
-    print(f"DEBUG: Returning updated task with tag '{response_task.tag}'")
-    return response_task
+        async with locked_task_manager() as task_manager:
+            task = get_existing_task(task_manager, task_id)
+            if key != crud.tag_key(task):
+                continue
 
+            task = crud.update_task(task_manager, task_id, get_tag=False, tag=tag)
+            logger.debug("Updated task (id=%s) tag to '%s'", task.id, task.tag)
 
-@app.post("/tasks/batch", response_model=List[TaskResponse], tags=["Bulk Operations"])
-async def create_batch_tasks(
-    batch_request: TaskBatchCreate,
-    task_manager: TaskManager = Depends(get_task_manager),
-):
+            save_tasks(task_manager)
 
-    created_tasks = []
+        return task_response(task)
 
-    for task_data in batch_request.tasks:
-        created_task = crud.create_task(
-            task_manager=task_manager,
-            title=task_data.title,
-            description=task_data.description,
-            due_date=task_data.due_date,
-            priority=task_data.priority,
-            completed=task_data.completed,
+
+@app.get("/metrics", tags=["Monitoring"])
+async def metrics():
+
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/admin/profiles", tags=["Monitoring"])
+async def list_profiles():
+
+    return {
+        "enabled": PROFILING_ENABLED,
+        "note": PROFILE_NOTE,
+        "profiles": request_profiles.list(),
+    }
+
+
+@app.get(
+    "/admin/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    tags=["Monitoring"],
+)
+async def get_profile(
+    profile_id: int = Path(..., description="ID of the profile to retrieve"),
+):
+
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=404, detail=f"Profile with ID {profile_id} not found"
         )
-        created_tasks.append(created_task)
 
-    save_tasks(task_manager)
+    return PlainTextResponse(profile["stats"])
+
+
+@app.delete("/admin/profiles", tags=["Monitoring"])
+async def clear_profiles():
+
+    cleared_count = request_profiles.clear()
+
+    return {"message": f"Cleared {cleared_count} profiles"}
 
-    response_tasks = []
-    for task in created_tasks:
 
-        tag = task.tag if task.tag is not None else ""
+@app.get("/tagger/cache", tags=["Tagger"])
+async def get_tag_cache_stats():
 
-        response_tasks.append(
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                due_date=task.due_date,
-                priority=task.priority,
-                completed=task.completed,
+    return tag_cache.stats()
+
+
+@app.post("/tasks/batch", response_model=List[TaskResponse], tags=["Bulk Operations"])
+async def create_batch_tasks(batch_request: TaskBatchCreate):
+
+    tags = await crud.get_tags_async(
+        [(task_data.due_date, task_data.priority) for task_data in batch_request.tasks]
+    )
+
+    async with locked_task_manager() as task_manager:
+        created_tasks = []
+
+        for task_data, tag in zip(batch_request.tasks, tags):
+            created_task = crud.create_task(
+                task_manager=task_manager,
+                title=task_data.title,
+                description=task_data.description,
+                due_date=task_data.due_date,
+                priority=task_data.priority,
+                completed=task_data.completed,
+                get_tag=False,
                 tag=tag,
             )
-        )
+            created_tasks.append(created_task)
+
+        save_tasks(task_manager)
 
-    return response_tasks
+    return task_list_response(created_tasks)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,18 @@
+from tag_server.metrics import Histogram, MetricsRegistry
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "task_manager_request_duration_seconds",
+        "HTTP request latency by route",
+        ("method", "route", "status"),
+    )
+)
+STAGE_LATENCY = registry.register(
+    Histogram(
+        "task_manager_stage_duration_seconds",
+        "Time spent in file I/O, tag service calls and serialization",
+        ("stage",),
+    )
+)
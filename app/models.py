@@ -1,6 +1,20 @@
-from datetime import datetime
+import bisect
+import heapq
+import itertools
+import operator
+import sys
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from app.encoding import dumps
+from app.vector_index import (
+    VECTOR_INDEX_THRESHOLD,
+    VectorTaskIndex,
+    vector_index_available,
+)
+from tag_server.rules import generate_tags
 
 
 class Priority(str, Enum):
@@ -10,8 +24,50 @@ class Priority(str, Enum):
     HIGH = "High"
 
 
+def encode_task_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+
+    encoded = {}
+    for name, value in fields.items():
+        if name == "due_date":
+            value = value.isoformat()
+        elif name == "priority":
+            value = value.value
+        encoded[name] = value
+    return encoded
+
+
+def decode_task_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+
+    decoded = dict(fields)
+    if "due_date" in decoded:
+        decoded["due_date"] = datetime.fromisoformat(decoded["due_date"])
+    if "priority" in decoded:
+        decoded["priority"] = Priority(decoded["priority"])
+    return decoded
+
+
+SCAN_TO_SORT_RATIO = 10
+
+
+class TaskOrder(str, Enum):
+
+    ID = "id"
+    DUE_DATE = "due_date"
+
+
 class Task:
 
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "due_date",
+        "priority",
+        "completed",
+        "tag",
+        "_json",
+    )
+
     def __init__(
         self,
         task_id: int,
@@ -29,15 +85,18 @@ class Task:
         self.due_date = due_date
         self.priority = priority
         self.completed = completed
-        self.tag = tag
+        self.tag = sys.intern(tag) if tag is not None else None
+        self._json: Optional[bytes] = None
 
     def mark_complete(self) -> None:
 
         self.completed = True
+        self._json = None
 
     def mark_incomplete(self) -> None:
 
         self.completed = False
+        self._json = None
 
     def update(
         self,
@@ -60,7 +119,8 @@ class Task:
         if completed is not None:
             self.completed = completed
         if tag is not None:
-            self.tag = tag
+            self.tag = sys.intern(tag)
+        self._json = None
 
     def to_dict(self) -> Dict[str, Union[int, str, bool]]:
 
@@ -74,6 +134,30 @@ class Task:
             "tag": self.tag,
         }
 
+    def to_response_dict(self) -> Dict[str, Union[int, str, bool]]:
+
+        return {
+            "title": self.title,
+            "description": self.description,
+            "due_date": self.due_date.isoformat(),
+            "priority": self.priority.value,
+            "id": self.id,
+            "completed": self.completed,
+            "tag": self.tag if self.tag is not None else "",
+        }
+
+    def to_json(self) -> bytes:
+
+        if self._json is None:
+            self._json = memoryview(dumps(self.to_dict())).tobytes()
+        return self._json
+
+    def to_response_json(self) -> bytes:
+
+        if self.tag is None:
+            return dumps(self.to_response_dict())
+        return self.to_json()
+
     @classmethod
     def from_dict(cls, data: Dict[str, Union[int, str, bool]]) -> "Task":
 
@@ -88,12 +172,247 @@ class Task:
         )
 
 
-class TaskManager:
+class BaseTaskManager(ABC):
+
+    next_id: int
+
+    def __init__(self):
+
+        self.pending_changes: List[Tuple[str, int, Dict[str, Any]]] = []
+
+    def drain_changes(self) -> List[Tuple[str, int, Dict[str, Any]]]:
+
+        changes = self.pending_changes
+        self.pending_changes = []
+        return changes
+
+    @abstractmethod
+    def add_task(
+        self,
+        title: str,
+        description: str,
+        due_date: datetime,
+        priority: Priority,
+        completed: bool = False,
+        tag: Optional[str] = None,
+    ) -> Task:
+
+        pass
+
+    @abstractmethod
+    def get_task(self, task_id: int) -> Optional[Task]:
+
+        pass
+
+    @abstractmethod
+    def update_task(
+        self,
+        task_id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        due_date: Optional[datetime] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        tag: Optional[str] = None,
+    ) -> Optional[Task]:
+
+        pass
+
+    @abstractmethod
+    def delete_task(self, task_id: int) -> bool:
+
+        pass
+
+    @abstractmethod
+    def list_tasks(self) -> List[Task]:
+
+        pass
+
+    @abstractmethod
+    def mark_tasks_complete(self, task_ids: List[int]) -> List[Task]:
+
+        pass
+
+    @abstractmethod
+    def mark_tasks_incomplete(self, task_ids: List[int]) -> List[Task]:
+
+        pass
+
+    @abstractmethod
+    def delete_tasks(self, task_ids: List[int]) -> int:
+
+        pass
+
+    @abstractmethod
+    def stale_tags(self, today: date) -> List[Tuple[int, str]]:
+
+        pass
+
+    @abstractmethod
+    def set_tags(self, tags: List[Tuple[int, str]]) -> int:
+
+        pass
+
+    @abstractmethod
+    def tasks_due_on(self, due_date: date) -> List[Task]:
+
+        pass
+
+    @abstractmethod
+    def filter_tasks(
+        self, completed: Optional[bool] = None, priority: Optional[Priority] = None
+    ) -> List[Task]:
+
+        pass
+
+    @abstractmethod
+    def completion_counts(self) -> Dict[bool, int]:
+
+        pass
+
+    @abstractmethod
+    def count_tasks(self, completed: Optional[bool] = None) -> Dict[str, Any]:
+
+        pass
+
+    @abstractmethod
+    def page_tasks(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[Priority] = None,
+        order_by: TaskOrder = TaskOrder.ID,
+        after: Optional[Any] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Task], Optional[Any]]:
+
+        pass
+
+
+class TaskManager(BaseTaskManager):
 
     def __init__(self):
 
+        super().__init__()
         self.tasks: Dict[int, Task] = {}
         self.next_id: int = 1
+        self._completed_index: Dict[bool, Set[int]] = {True: set(), False: set()}
+        self._priority_index: Dict[Priority, Set[int]] = {
+            priority: set() for priority in Priority
+        }
+        self._due_date_index: List[Tuple[str, int]] = []
+        self._id_index: List[int] = []
+        self._vector_index: Optional[VectorTaskIndex] = None
+
+    def _vector_upsert(self, task: Task) -> None:
+
+        self._vector_index.upsert(
+            task.id, task.due_date, task.priority.value, task.completed, task.tag
+        )
+
+    def _maybe_enable_vector_index(self) -> None:
+
+        if (
+            self._vector_index is None
+            and len(self.tasks) >= VECTOR_INDEX_THRESHOLD
+            and vector_index_available()
+        ):
+            tasks = self.list_tasks()
+            self._vector_index = VectorTaskIndex.from_columns(
+                [task.id for task in tasks],
+                [task.due_date for task in tasks],
+                [task.priority.value for task in tasks],
+                [task.completed for task in tasks],
+                [task.tag for task in tasks],
+            )
+
+    def _index_task(self, task: Task) -> None:
+
+        self._completed_index[task.completed].add(task.id)
+        self._priority_index[task.priority].add(task.id)
+        bisect.insort(self._due_date_index, (task.due_date.isoformat(), task.id))
+        bisect.insort(self._id_index, task.id)
+        if self._vector_index is not None:
+            self._vector_upsert(task)
+
+    def _unindex_task(self, task: Task) -> None:
+
+        self._completed_index[task.completed].discard(task.id)
+        self._priority_index[task.priority].discard(task.id)
+        entry = (task.due_date.isoformat(), task.id)
+        position = bisect.bisect_left(self._due_date_index, entry)
+        if (
+            position < len(self._due_date_index)
+            and self._due_date_index[position] == entry
+        ):
+            del self._due_date_index[position]
+        position = bisect.bisect_left(self._id_index, task.id)
+        if position < len(self._id_index) and self._id_index[position] == task.id:
+            del self._id_index[position]
+
+    def _update_task_fields(self, task: Task, **fields: Any) -> None:
+
+        reindex = any(
+            fields.get(name) is not None
+            for name in ("due_date", "priority", "completed")
+        )
+        if reindex:
+            self._unindex_task(task)
+        task.update(**fields)
+        if reindex:
+            self._index_task(task)
+        elif self._vector_index is not None and fields.get("tag") is not None:
+            self._vector_upsert(task)
+
+    def insert_task(self, task: Task) -> None:
+
+        existing = self.tasks.get(task.id)
+        if existing:
+            self._unindex_task(existing)
+        self.tasks[task.id] = task
+        self._index_task(task)
+        self._maybe_enable_vector_index()
+
+    def insert_tasks(self, tasks: List[Task]) -> None:
+
+        for task in tasks:
+            existing = self.tasks.get(task.id)
+            if existing:
+                self._unindex_task(existing)
+            self.tasks[task.id] = task
+            self._completed_index[task.completed].add(task.id)
+            self._priority_index[task.priority].add(task.id)
+            self._due_date_index.append((task.due_date.isoformat(), task.id))
+            self._id_index.append(task.id)
+            if self._vector_index is not None:
+                self._vector_upsert(task)
+        self._due_date_index.sort()
+        self._id_index.sort()
+        self._maybe_enable_vector_index()
+
+    def _remove_task(self, task_id: int) -> bool:
+
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return False
+        self._unindex_task(task)
+        if self._vector_index is not None:
+            self._vector_index.remove(task_id)
+        return True
+
+    def apply_change(self, op: str, task_id: int, fields: Dict[str, Any]) -> None:
+
+        if op == "add":
+            task = Task.from_dict(fields)
+            self.insert_task(task)
+            self.next_id = max(self.next_id, task.id + 1)
+        elif op == "update":
+            task = self.get_task(task_id)
+            if task:
+                self._update_task_fields(task, **decode_task_fields(fields))
+        elif op == "delete":
+            self._remove_task(task_id)
+        else:
+            raise ValueError(f"Invalid change operation: {op}")
 
     def add_task(
         self,
@@ -114,8 +433,9 @@ class TaskManager:
             completed=completed,
             tag=tag,
         )
-        self.tasks[task.id] = task
+        self.insert_task(task)
         self.next_id += 1
+        self.pending_changes.append(("add", task.id, task.to_dict()))
         return task
 
     def get_task(self, task_id: int) -> Optional[Task]:
@@ -135,20 +455,26 @@ class TaskManager:
 
         task = self.get_task(task_id)
         if task:
-            task.update(
-                title=title,
-                description=description,
-                due_date=due_date,
-                priority=priority,
-                completed=completed,
-                tag=tag,
-            )
+            changed = {
+                "title": title,
+                "description": description,
+                "due_date": due_date,
+                "priority": priority,
+                "completed": completed,
+                "tag": tag,
+            }
+            changed = {k: v for k, v in changed.items() if v is not None}
+            if changed:
+                self._update_task_fields(task, **changed)
+                self.pending_changes.append(
+                    ("update", task_id, encode_task_fields(changed))
+                )
         return task
 
     def delete_task(self, task_id: int) -> bool:
 
-        if task_id in self.tasks:
-            del self.tasks[task_id]
+        if self._remove_task(task_id):
+            self.pending_changes.append(("delete", task_id, {}))
             return True
         return False
 
@@ -156,25 +482,33 @@ class TaskManager:
 
         return list(self.tasks.values())
 
-    def mark_tasks_complete(self, task_ids: List[int]) -> List[Task]:
+    def _set_completed(self, task_ids: List[int], completed: bool) -> List[Task]:
 
         updated_tasks = []
         for task_id in task_ids:
             task = self.get_task(task_id)
             if task:
-                task.mark_complete()
+                self._completed_index[task.completed].discard(task_id)
+                if completed:
+                    task.mark_complete()
+                else:
+                    task.mark_incomplete()
+                self._completed_index[completed].add(task_id)
+                if self._vector_index is not None:
+                    self._vector_index.set_completed(task_id, completed)
+                self.pending_changes.append(
+                    ("update", task_id, {"completed": completed})
+                )
                 updated_tasks.append(task)
         return updated_tasks
 
+    def mark_tasks_complete(self, task_ids: List[int]) -> List[Task]:
+
+        return self._set_completed(task_ids, True)
+
     def mark_tasks_incomplete(self, task_ids: List[int]) -> List[Task]:
 
-        updated_tasks = []
-        for task_id in task_ids:
-            task = self.get_task(task_id)
-            if task:
-                task.mark_incomplete()
-                updated_tasks.append(task)
-        return updated_tasks
+        return self._set_completed(task_ids, False)
 
     def delete_tasks(self, task_ids: List[int]) -> int:
 
@@ -184,20 +518,201 @@ class TaskManager:
                 deleted_count += 1
         return deleted_count
 
+    def stale_tags(self, today: date) -> List[Tuple[int, str]]:
+
+        if self._vector_index is not None:
+            return list(zip(*self._vector_index.stale_tags(today)))
+
+        tasks = self.list_tasks()
+        tags = generate_tags(
+            [(task.due_date.date() - today).days for task in tasks],
+            [task.priority.value for task in tasks],
+        )
+        return [(task.id, tag) for task, tag in zip(tasks, tags) if tag != task.tag]
+
+    def set_tags(self, tags: List[Tuple[int, str]]) -> int:
+
+        updated_count = 0
+        for task_id, tag in tags:
+            task = self.get_task(task_id)
+            if task:
+                task.update(tag=tag)
+                if self._vector_index is not None:
+                    self._vector_index.set_tag(task_id, tag)
+                self.pending_changes.append(("update", task_id, {"tag": tag}))
+                updated_count += 1
+        return updated_count
+
+    def tasks_due_on(self, due_date: date) -> List[Task]:
+
+        next_day = due_date + timedelta(days=1)
+        start = bisect.bisect_left(self._due_date_index, (due_date.isoformat(),))
+        end = bisect.bisect_left(self._due_date_index, (next_day.isoformat(),))
+        return [self.tasks[task_id] for _, task_id in self._due_date_index[start:end]]
+
     def filter_tasks(
         self, completed: Optional[bool] = None, priority: Optional[Priority] = None
     ) -> List[Task]:
 
-        filtered_tasks = self.list_tasks()
+        if self._vector_index is not None and (
+            completed is not None or priority is not None
+        ):
+            task_ids = self._vector_index.query_ids(
+                completed=completed,
+                priority=priority.value if priority is not None else None,
+            )
+            return [self.tasks[task_id] for task_id in task_ids]
 
-        if completed is not None:
-            filtered_tasks = [
-                task for task in filtered_tasks if task.completed == completed
-            ]
+        filter_sets = self._filter_sets(completed, priority)
 
+        if not filter_sets:
+            return self.list_tasks()
+
+        matching_ids = filter_sets[0].intersection(*filter_sets[1:])
+        return [self.tasks[task_id] for task_id in sorted(matching_ids)]
+
+    def _filter_sets(
+        self, completed: Optional[bool] = None, priority: Optional[Priority] = None
+    ) -> List[Set[int]]:
+
+        filter_sets = []
+        if completed is not None:
+            filter_sets.append(self._completed_index[completed])
         if priority is not None:
-            filtered_tasks = [
-                task for task in filtered_tasks if task.priority == priority
-            ]
+            filter_sets.append(self._priority_index[priority])
+        return filter_sets
+
+    def _scan_is_cheaper(
+        self, filter_sets: List[Set[int]], count: Optional[int]
+    ) -> bool:
+
+        total = max(len(self.tasks), 1)
+        expected_matches = float(total)
+        for task_ids in filter_sets:
+            expected_matches *= len(task_ids) / total
+
+        scanned_rows = float(total)
+        if count is not None and expected_matches >= 1:
+            scanned_rows = min(scanned_rows, count * total / expected_matches)
+        smallest = min(len(task_ids) for task_ids in filter_sets)
+        return scanned_rows < SCAN_TO_SORT_RATIO * smallest
+
+    def completion_counts(self) -> Dict[bool, int]:
 
-        return filtered_tasks
+        return {
+            completed: len(task_ids)
+            for completed, task_ids in self._completed_index.items()
+        }
+
+    def count_tasks(self, completed: Optional[bool] = None) -> Dict[str, Any]:
+
+        by_tag: Dict[str, int] = {}
+
+        if self._vector_index is not None:
+            by_priority = self._vector_index.count_by_priority(completed=completed)
+            for tag, count in self._vector_index.count_by_tag(completed).items():
+                by_tag[tag or ""] = by_tag.get(tag or "", 0) + count
+        else:
+            by_priority = {priority.value: 0 for priority in Priority}
+            for task in self.filter_tasks(completed=completed):
+                by_priority[task.priority.value] += 1
+                by_tag[task.tag or ""] = by_tag.get(task.tag or "", 0) + 1
+
+        return {
+            "total": sum(by_priority.values()),
+            "by_priority": by_priority,
+            "by_tag": by_tag,
+        }
+
+    def _vector_page_ids(
+        self,
+        completed: Optional[bool],
+        priority: Optional[Priority],
+        by_due_date: bool,
+        after_key: Optional[Any],
+        count: Optional[int],
+    ) -> List[int]:
+
+        after_due = after_id = None
+        if after_key is not None and by_due_date:
+            after_due, after_id = datetime.fromisoformat(after_key[0]), after_key[1]
+        elif after_key is not None:
+            after_id = after_key
+
+        return self._vector_index.page_ids(
+            completed=completed,
+            priority=priority.value if priority is not None else None,
+            by_due_date=by_due_date,
+            after_due=after_due,
+            after_id=after_id,
+            count=count,
+        )
+
+    def page_tasks(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[Priority] = None,
+        order_by: TaskOrder = TaskOrder.ID,
+        after: Optional[Any] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Task], Optional[Any]]:
+
+        filter_sets = self._filter_sets(completed, priority)
+        count = None if limit is None else limit + 1
+
+        by_due_date = order_by == TaskOrder.DUE_DATE
+        if by_due_date:
+            index = self._due_date_index
+            after_key = None if after is None else tuple(after)
+        else:
+            index = self._id_index
+            after_key = after
+        start = 0 if after_key is None else bisect.bisect_right(index, after_key)
+
+        sort_matches = bool(filter_sets) and not self._scan_is_cheaper(
+            filter_sets, count
+        )
+
+        if sort_matches and self._vector_index is not None:
+            task_ids = self._vector_page_ids(
+                completed, priority, by_due_date, after_key, count
+            )
+        elif sort_matches:
+            entries = [
+                page_entry(self.tasks[task_id], order_by)
+                for task_id in min(filter_sets, key=len)
+                if all(task_id in task_ids for task_ids in filter_sets)
+            ]
+            if after_key is not None:
+                entries = [entry for entry in entries if entry > after_key]
+            if count is None:
+                entries.sort()
+            else:
+                entries = heapq.nsmallest(count, entries)
+            task_ids = [entry[1] for entry in entries] if by_due_date else entries
+        else:
+            scanned = itertools.islice(index, start, None)
+            if by_due_date:
+                scanned = map(operator.itemgetter(1), scanned)
+            for filter_set in filter_sets:
+                scanned = filter(filter_set.__contains__, scanned)
+            task_ids = list(itertools.islice(scanned, count))
+
+        page = [self.tasks[task_id] for task_id in task_ids[:limit]]
+        if limit is not None and len(task_ids) > limit:
+            return page, page_key(page[-1], order_by)
+        return page, None
+
+
+def page_entry(task: Task, order_by: TaskOrder) -> Any:
+
+    if order_by == TaskOrder.DUE_DATE:
+        return (task.due_date.isoformat(), task.id)
+    return task.id
+
+
+def page_key(task: Task, order_by: TaskOrder) -> Any:
+
+    if order_by == TaskOrder.DUE_DATE:
+        return [task.due_date.isoformat(), task.id]
+    return task.id
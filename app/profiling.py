@@ -0,0 +1,216 @@
+import asyncio
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILING_SLOW_MS = float(os.environ.get("PROFILING_SLOW_MS", "500"))
+PROFILING_MAX_PER_MINUTE = int(os.environ.get("PROFILING_MAX_PER_MINUTE", "6"))
+PROFILING_MAX_REQUESTED_PER_MINUTE = int(
+    os.environ.get("PROFILING_MAX_REQUESTED_PER_MINUTE", "30")
+)
+PROFILING_BUFFER_SIZE = int(os.environ.get("PROFILING_BUFFER_SIZE", "20"))
+PROFILING_STATS_LIMIT = int(os.environ.get("PROFILING_STATS_LIMIT", "40"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "profile"
+TRUE_VALUES = ("1", "true", "yes")
+PROFILE_NOTE = (
+    "cProfile traces the whole event loop thread, so these stats also include "
+    "other requests and background tasks that ran while this request was in "
+    "flight; overlapping_requests counts the requests that did."
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileBuffer:
+
+    def __init__(self, max_size: int = PROFILING_BUFFER_SIZE):
+
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=max_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+
+        with self._lock:
+            profile["id"] = next(self._ids)
+            self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[Dict[str, Any]]:
+
+        with self._lock:
+            return [
+                {key: value for key, value in profile.items() if key != "stats"}
+                for profile in reversed(self._profiles)
+            ]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            for profile in self._profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+    def clear(self) -> int:
+
+        with self._lock:
+            count = len(self._profiles)
+            self._profiles.clear()
+        return count
+
+
+def format_profile_stats(profiler: cProfile.Profile, limit: int) -> str:
+
+    stream = io.StringIO()
+    stream.write(f"Note: {PROFILE_NOTE}\n\n")
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfilingMiddleware:
+
+    def __init__(
+        self,
+        app,
+        profiles: ProfileBuffer,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        slow_ms: float = PROFILING_SLOW_MS,
+        max_per_minute: int = PROFILING_MAX_PER_MINUTE,
+        max_requested_per_minute: int = PROFILING_MAX_REQUESTED_PER_MINUTE,
+        stats_limit: int = PROFILING_STATS_LIMIT,
+    ):
+
+        self.app = app
+        self.profiles = profiles
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_per_minute = max_per_minute
+        self.max_requested_per_minute = max_requested_per_minute
+        self.stats_limit = stats_limit
+        self._sampled_starts: Deque[float] = deque()
+        self._requested_starts: Deque[float] = deque()
+        self._requested_lock = asyncio.Lock()
+        self._active: Optional[Dict[str, Any]] = None
+        self._in_flight = 0
+        self._started = 0
+
+    def _requested(self, scope) -> bool:
+
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_HEADER:
+                return value.decode("latin-1").lower() in TRUE_VALUES
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        values = query.get(PROFILE_QUERY_PARAM, [])
+        return bool(values) and values[-1].lower() in TRUE_VALUES
+
+    def _take_budget(self, starts: Deque[float], limit: int) -> bool:
+
+        now = time.monotonic()
+        while starts and now - starts[0] > 60:
+            starts.popleft()
+
+        if len(starts) >= limit:
+            return False
+        starts.append(now)
+        return True
+
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        self._started += 1
+        try:
+            await self._dispatch(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _dispatch(self, scope, receive, send):
+
+        if self._requested(scope):
+            if self._take_budget(self._requested_starts, self.max_requested_per_minute):
+                async with self._requested_lock:
+                    await self._profile(scope, receive, send, requested=True)
+                return
+            logger.warning(
+                "Profiling allowance used up, not profiling %s %s",
+                scope["method"],
+                scope["path"],
+            )
+        elif (
+            self._active is None
+            and random.random() < self.sample_rate
+            and self._take_budget(self._sampled_starts, self.max_per_minute)
+        ):
+            await self._profile(scope, receive, send, requested=False)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _profile(self, scope, receive, send, requested: bool) -> None:
+
+        status_code = 500
+
+        async def send_with_status(message):
+
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        if self._active is not None:
+            self._active["profiler"].disable()
+            self._active["preempted"] = True
+
+        profiler = cProfile.Profile()
+        active = self._active = {"profiler": profiler, "preempted": False}
+        already_in_flight = self._in_flight - 1
+        started = self._started
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if self._active is active:
+                profiler.disable()
+                self._active = None
+            duration_ms = (time.perf_counter() - start) * 1000
+            overlapping = already_in_flight + self._started - started
+
+            if not active["preempted"] and (requested or duration_ms >= self.slow_ms):
+                self.profiles.add(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(duration_ms, 3),
+                        "reason": "requested" if requested else "slow",
+                        "recorded_at": datetime.now().isoformat(),
+                        "overlapping_requests": overlapping,
+                        "note": PROFILE_NOTE,
+                        "stats": format_profile_stats(profiler, self.stats_limit),
+                    }
+                )
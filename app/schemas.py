@@ -44,6 +44,9 @@ class TaskListResponse(BaseModel):
 
     tasks: List[TaskResponse] = Field(..., description="List of tasks")
     count: int = Field(..., description="Total number of tasks")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
 
 
 class BulkTaskIdsRequest(BaseModel):
@@ -0,0 +1,80 @@
+from typing import Any, AsyncIterator, Iterable, Optional, Tuple
+
+from fastapi.responses import Response
+
+from app.encoding import dumps
+from app.metrics import STAGE_LATENCY
+from app.models import BaseTaskManager, Priority, Task, TaskOrder
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_PAGE_SIZE = 500
+
+
+class JSONBytesResponse(Response):
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+@STAGE_LATENCY.time("serialization")
+def task_response(task: Task) -> JSONBytesResponse:
+
+    return JSONBytesResponse(task.to_response_json())
+
+
+@STAGE_LATENCY.time("serialization")
+def encode_task_array(tasks: Iterable[Task]) -> Tuple[bytes, int]:
+
+    fragments = [task.to_response_json() for task in tasks]
+    return b"[" + b",".join(fragments) + b"]", len(fragments)
+
+
+def task_list_response(tasks: Iterable[Task]) -> JSONBytesResponse:
+
+    body, _ = encode_task_array(tasks)
+    return JSONBytesResponse(body)
+
+
+def task_page_response(
+    tasks: Iterable[Task], next_cursor: Optional[str] = None
+) -> JSONBytesResponse:
+
+    body, count = encode_task_array(tasks)
+    return JSONBytesResponse(
+        b'{"tasks":'
+        + body
+        + b',"count":'
+        + str(count).encode()
+        + b',"next_cursor":'
+        + dumps(next_cursor)
+        + b"}"
+    )
+
+
+async def stream_tasks_ndjson(
+    task_manager: BaseTaskManager,
+    completed: Optional[bool] = None,
+    priority: Optional[Priority] = None,
+    page_size: int = STREAM_PAGE_SIZE,
+) -> AsyncIterator[bytes]:
+
+    after = None
+    while True:
+        tasks, after = task_manager.page_tasks(
+            completed=completed,
+            priority=priority,
+            order_by=TaskOrder.ID,
+            after=after,
+            limit=page_size,
+        )
+
+        if tasks:
+            yield b"".join(task.to_response_json() + b"\n" for task in tasks)
+
+        if after is None:
+            return
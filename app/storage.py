@@ -0,0 +1,657 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models import (
+    BaseTaskManager,
+    Priority,
+    Task,
+    TaskManager,
+    TaskOrder,
+    page_key,
+)
+from app.utils import FileLock, load_tasks_from_file, save_tasks_to_file
+from tag_server.rules import generate_tags
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    tag TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_tag ON tasks (tag);
+"""
+
+TASK_COLUMNS = "id, title, description, due_date, priority, completed, tag"
+
+SQLITE_MAX_PARAMS = 500
+
+logger = logging.getLogger(__name__)
+
+
+def _stat_signature(file_path: str) -> Optional[Tuple[int, int, int]]:
+
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class TaskStorage(ABC):
+
+    @abstractmethod
+    def load(self) -> BaseTaskManager:
+
+        pass
+
+    @abstractmethod
+    def get_task_manager(self) -> BaseTaskManager:
+
+        pass
+
+    @abstractmethod
+    def save(self, task_manager: BaseTaskManager) -> bool:
+
+        pass
+
+    @abstractmethod
+    def write_lock(self):
+
+        pass
+
+    def close(self) -> None:
+
+        pass
+
+
+class JsonFileStorage(TaskStorage):
+
+    def __init__(self, file_path: str):
+
+        self.file_path = file_path
+        self.task_manager: Optional[TaskManager] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._lock = FileLock(file_path)
+
+    def load(self) -> TaskManager:
+
+        self._signature = _stat_signature(self.file_path)
+        self.task_manager = load_tasks_from_file(self.file_path)
+        return self.task_manager
+
+    def get_task_manager(self) -> TaskManager:
+
+        if (
+            self.task_manager is None
+            or _stat_signature(self.file_path) != self._signature
+        ):
+            return self.load()
+        return self.task_manager
+
+    def save(self, task_manager: TaskManager) -> bool:
+
+        task_manager.drain_changes()
+        saved = save_tasks_to_file(task_manager, self.file_path)
+        if saved:
+            self._signature = _stat_signature(self.file_path)
+        return saved
+
+    def write_lock(self) -> FileLock:
+
+        return self._lock
+
+
+class JournalStorage(TaskStorage):
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        journal_path: Optional[str] = None,
+        fsync_interval: float = 1.0,
+        fsync_batch_size: int = 256,
+        compact_threshold: int = 10000,
+    ):
+
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or f"{snapshot_path}.journal"
+        self.fsync_interval = fsync_interval
+        self.fsync_batch_size = fsync_batch_size
+        self.compact_threshold = compact_threshold
+        self.task_manager: Optional[TaskManager] = None
+        self._snapshot_signature: Optional[Tuple[int, int, int]] = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._unsynced_records = 0
+        self._last_fsync = time.monotonic()
+        self._journal_file = None
+        self._lock = FileLock(snapshot_path)
+
+    def _open_journal(self):
+
+        if self._journal_file is None:
+            os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+            self._journal_file = open(self.journal_path, "ab")
+        return self._journal_file
+
+    def _replay_journal(self, task_manager: TaskManager, offset: int) -> int:
+
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                    task_manager.apply_change(
+                        record["op"], record["id"], record["fields"]
+                    )
+                except (json.JSONDecodeError, KeyError, ValueError) as e:
+                    logger.error(
+                        "Error replaying journal record in %s: %s", self.journal_path, e
+                    )
+                offset += len(line)
+                self._journal_records += 1
+
+        return offset
+
+    def load(self) -> TaskManager:
+
+        self._snapshot_signature = _stat_signature(self.snapshot_path)
+        self.task_manager = load_tasks_from_file(self.snapshot_path)
+        self._journal_records = 0
+        self._journal_offset = self._replay_journal(self.task_manager, 0)
+        return self.task_manager
+
+    def get_task_manager(self) -> TaskManager:
+
+        if (
+            self.task_manager is None
+            or _stat_signature(self.snapshot_path) != self._snapshot_signature
+        ):
+            return self.load()
+
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except OSError:
+            journal_size = 0
+
+        if journal_size < self._journal_offset:
+            return self.load()
+        if journal_size > self._journal_offset:
+            self._journal_offset = self._replay_journal(
+                self.task_manager, self._journal_offset
+            )
+        return self.task_manager
+
+    def save(self, task_manager: TaskManager) -> bool:
+
+        changes = task_manager.drain_changes()
+        if not changes:
+            return True
+
+        data = b"".join(
+            json.dumps(
+                {"op": op, "id": task_id, "fields": fields}, separators=(",", ":")
+            ).encode()
+            + b"\n"
+            for op, task_id, fields in changes
+        )
+
+        try:
+            journal = self._open_journal()
+            journal.write(data)
+            journal.flush()
+        except IOError as e:
+            logger.error("Error appending to journal %s: %s", self.journal_path, e)
+            return False
+
+        self._journal_offset += len(data)
+        self._journal_records += len(changes)
+        self._unsynced_records += len(changes)
+
+        if (
+            self._unsynced_records >= self.fsync_batch_size
+            or time.monotonic() - self._last_fsync >= self.fsync_interval
+        ):
+            self.sync()
+
+        if self._journal_records >= self.compact_threshold:
+            return self.compact(task_manager)
+        return True
+
+    def sync(self) -> None:
+
+        if self._journal_file is not None and self._unsynced_records:
+            os.fsync(self._journal_file.fileno())
+        self._unsynced_records = 0
+        self._last_fsync = time.monotonic()
+
+    def compact(self, task_manager: Optional[TaskManager] = None) -> bool:
+
+        task_manager = task_manager or self.task_manager
+        if task_manager is None:
+            return True
+
+        if not save_tasks_to_file(task_manager, self.snapshot_path):
+            return False
+
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        open(self.journal_path, "wb").close()
+
+        self._snapshot_signature = _stat_signature(self.snapshot_path)
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._unsynced_records = 0
+        return True
+
+    def write_lock(self) -> FileLock:
+
+        return self._lock
+
+    def close(self) -> None:
+
+        with self._lock:
+            self.get_task_manager()
+            self.sync()
+            self.compact()
+
+
+def _row_to_task(row: Tuple[Any, ...]) -> Task:
+
+    return Task(
+        task_id=row[0],
+        title=row[1],
+        description=row[2],
+        due_date=datetime.fromisoformat(row[3]),
+        priority=Priority(row[4]),
+        completed=bool(row[5]),
+        tag=row[6],
+    )
+
+
+def _chunks(items: List[int], size: int = SQLITE_MAX_PARAMS) -> Iterable[List[int]]:
+
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class SQLiteTaskManager(BaseTaskManager):
+
+    def __init__(self, connection: sqlite3.Connection):
+
+        super().__init__()
+        self.connection = connection
+
+    @property
+    def next_id(self) -> int:
+
+        row = self.connection.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+        ).fetchone()
+        return (row[0] if row else 0) + 1
+
+    def _query(
+        self, where: str = "", params: Iterable[Any] = (), order: str = "id"
+    ) -> List[Task]:
+
+        rows = self.connection.execute(
+            f"SELECT {TASK_COLUMNS} FROM tasks {where} ORDER BY {order}", tuple(params)
+        ).fetchall()
+        return [_row_to_task(row) for row in rows]
+
+    def _query_ids(self, task_ids: List[int]) -> List[Task]:
+
+        found = {}
+        for chunk in _chunks(task_ids):
+            placeholders = ",".join("?" * len(chunk))
+            for task in self._query(f"WHERE id IN ({placeholders})", chunk):
+                found[task.id] = task
+        return [found[task_id] for task_id in task_ids if task_id in found]
+
+    def add_task(
+        self,
+        title: str,
+        description: str,
+        due_date: datetime,
+        priority: Priority,
+        completed: bool = False,
+        tag: Optional[str] = None,
+    ) -> Task:
+
+        cursor = self.connection.execute(
+            "INSERT INTO tasks (title, description, due_date, priority, completed, tag)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (title, description, due_date.isoformat(), priority.value, completed, tag),
+        )
+        return Task(
+            task_id=cursor.lastrowid,
+            title=title,
+            description=description,
+            due_date=due_date,
+            priority=priority,
+            completed=completed,
+            tag=tag,
+        )
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+
+        tasks = self._query("WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def update_task(
+        self,
+        task_id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        due_date: Optional[datetime] = None,
+        priority: Optional[Priority] = None,
+        completed: Optional[bool] = None,
+        tag: Optional[str] = None,
+    ) -> Optional[Task]:
+
+        changed = {
+            "title": title,
+            "description": description,
+            "due_date": due_date.isoformat() if due_date is not None else None,
+            "priority": priority.value if priority is not None else None,
+            "completed": completed,
+            "tag": tag,
+        }
+        changed = {k: v for k, v in changed.items() if v is not None}
+
+        if changed:
+            assignments = ", ".join(f"{column} = ?" for column in changed)
+            self.connection.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ?",
+                (*changed.values(), task_id),
+            )
+        return self.get_task(task_id)
+
+    def delete_task(self, task_id: int) -> bool:
+
+        cursor = self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def list_tasks(self) -> List[Task]:
+
+        return self._query()
+
+    def _set_completed(self, task_ids: List[int], completed: bool) -> List[Task]:
+
+        with self.connection:
+            for chunk in _chunks(task_ids):
+                placeholders = ",".join("?" * len(chunk))
+                self.connection.execute(
+                    f"UPDATE tasks SET completed = ? WHERE id IN ({placeholders})",
+                    (completed, *chunk),
+                )
+        return self._query_ids(task_ids)
+
+    def mark_tasks_complete(self, task_ids: List[int]) -> List[Task]:
+
+        return self._set_completed(task_ids, True)
+
+    def mark_tasks_incomplete(self, task_ids: List[int]) -> List[Task]:
+
+        return self._set_completed(task_ids, False)
+
+    def delete_tasks(self, task_ids: List[int]) -> int:
+
+        deleted_count = 0
+        with self.connection:
+            for chunk in _chunks(list(dict.fromkeys(task_ids))):
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self.connection.execute(
+                    f"DELETE FROM tasks WHERE id IN ({placeholders})", chunk
+                )
+                deleted_count += cursor.rowcount
+        return deleted_count
+
+    def tasks_due_on(self, due_date: date) -> List[Task]:
+
+        next_day = due_date + timedelta(days=1)
+        return self._query(
+            "WHERE due_date >= ? AND due_date < ?",
+            (due_date.isoformat(), next_day.isoformat()),
+        )
+
+    def stale_tags(self, today: date) -> List[Tuple[int, str]]:
+
+        rows = self.connection.execute(
+            "SELECT id, due_date, priority, tag FROM tasks ORDER BY id"
+        ).fetchall()
+        tags = generate_tags(
+            [(date.fromisoformat(row[1][:10]) - today).days for row in rows],
+            [row[2] for row in rows],
+        )
+        return [(row[0], tag) for row, tag in zip(rows, tags) if tag != row[3]]
+
+    def set_tags(self, tags: List[Tuple[int, str]]) -> int:
+
+        with self.connection:
+            cursor = self.connection.executemany(
+                "UPDATE tasks SET tag = ? WHERE id = ?",
+                [(tag, task_id) for task_id, tag in tags],
+            )
+        return cursor.rowcount
+
+    def _filter_conditions(
+        self, completed: Optional[bool], priority: Optional[Priority]
+    ) -> Tuple[List[str], List[Any]]:
+
+        conditions = []
+        params: List[Any] = []
+
+        if completed is not None:
+            conditions.append("completed = ?")
+            params.append(completed)
+
+        if priority is not None:
+            conditions.append("priority = ?")
+            params.append(priority.value)
+
+        return conditions, params
+
+    def filter_tasks(
+        self, completed: Optional[bool] = None, priority: Optional[Priority] = None
+    ) -> List[Task]:
+
+        conditions, params = self._filter_conditions(completed, priority)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query(where, params)
+
+    def completion_counts(self) -> Dict[bool, int]:
+
+        counts = {True: 0, False: 0}
+        for completed, count in self.connection.execute(
+            "SELECT completed, COUNT(*) FROM tasks GROUP BY completed"
+        ):
+            counts[bool(completed)] = count
+        return counts
+
+    def count_tasks(self, completed: Optional[bool] = None) -> Dict[str, Any]:
+
+        conditions, params = self._filter_conditions(completed, None)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        by_priority = {priority.value: 0 for priority in Priority}
+        for priority, count in self.connection.execute(
+            f"SELECT priority, COUNT(*) FROM tasks {where} GROUP BY priority", params
+        ):
+            by_priority[priority] = count
+
+        by_tag: Dict[str, int] = {}
+        for tag, count in self.connection.execute(
+            f"SELECT tag, COUNT(*) FROM tasks {where} GROUP BY tag", params
+        ):
+            by_tag[tag or ""] = by_tag.get(tag or "", 0) + count
+
+        return {
+            "total": sum(by_priority.values()),
+            "by_priority": by_priority,
+            "by_tag": by_tag,
+        }
+
+    def page_tasks(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[Priority] = None,
+        order_by: TaskOrder = TaskOrder.ID,
+        after: Optional[Any] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Task], Optional[Any]]:
+
+        conditions, params = self._filter_conditions(completed, priority)
+
+        if order_by == TaskOrder.DUE_DATE:
+            order = "due_date, id"
+            if after is not None:
+                conditions.append("(due_date, id) > (?, ?)")
+                params.extend(after)
+        else:
+            order = "id"
+            if after is not None:
+                conditions.append("id > ?")
+                params.append(after)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        if limit is not None:
+            order = f"{order} LIMIT ?"
+            params.append(limit + 1)
+
+        page = self._query(where, params, order)
+        if limit is not None and len(page) > limit:
+            page = page[:limit]
+            return page, page_key(page[-1], order_by)
+        return page, None
+
+
+def connect_sqlite(db_path: str) -> sqlite3.Connection:
+
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SQLITE_SCHEMA)
+    return connection
+
+
+class SQLiteStorage(TaskStorage):
+
+    def __init__(self, db_path: str):
+
+        self.db_path = db_path
+        self.task_manager: Optional[SQLiteTaskManager] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> SQLiteTaskManager:
+
+        if self.task_manager is None:
+            self.task_manager = SQLiteTaskManager(connect_sqlite(self.db_path))
+        return self.task_manager
+
+    def get_task_manager(self) -> SQLiteTaskManager:
+
+        return self.load()
+
+    def save(self, task_manager: BaseTaskManager) -> bool:
+
+        task_manager.drain_changes()
+        return True
+
+    def write_lock(self) -> threading.Lock:
+
+        return self._lock
+
+    def close(self) -> None:
+
+        if self.task_manager is not None:
+            self.task_manager.connection.close()
+            self.task_manager = None
+
+
+def import_json_to_sqlite(json_path: str, db_path: str) -> int:
+
+    source = load_tasks_from_file(json_path)
+    connection = connect_sqlite(db_path)
+
+    try:
+        with connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO tasks ({TASK_COLUMNS})"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        task.id,
+                        task.title,
+                        task.description,
+                        task.due_date.isoformat(),
+                        task.priority.value,
+                        task.completed,
+                        task.tag,
+                    )
+                    for task in source.list_tasks()
+                ),
+            )
+            connection.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tasks'",
+                (source.next_id - 1,),
+            )
+    finally:
+        connection.close()
+
+    return len(source.tasks)
+
+
+def create_storage(backend: str, tasks_file: str, db_file: str) -> TaskStorage:
+
+    if backend == "json":
+        return JsonFileStorage(tasks_file)
+    if backend == "journal":
+        return JournalStorage(tasks_file)
+    if backend == "sqlite":
+        return SQLiteStorage(db_file)
+    raise ValueError(
+        f"Invalid storage backend: {backend}. Must be one of: json, journal, sqlite"
+    )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Import a tasks.json file into a SQLite task database"
+    )
+    parser.add_argument("json_path", help="Path of the tasks.json file to import")
+    parser.add_argument("db_path", help="Path of the SQLite database to write")
+
+    args = parser.parse_args()
+
+    imported = import_json_to_sqlite(args.json_path, args.db_path)
+    print(f"Imported {imported} tasks from {args.json_path} into {args.db_path}")
+
+
+if __name__ == "__main__":
+    main()
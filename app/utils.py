@@ -1,16 +1,113 @@
+import asyncio
+import base64
+import functools
 import json
+import logging
 import os
-from datetime import datetime
-from typing import Dict, List, Optional, Union
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+from app.metrics import STAGE_LATENCY
+from app.models import BaseTaskManager, Priority, Task, TaskManager, TaskOrder
+from tag_server.rules import TagCache, generate_tags
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_TAG_SERVICE_URL = os.environ.get("TAG_SERVICE_URL", "http://localhost:8001/tag")
+TAG_SERVICE_MODE = os.environ.get("TAG_SERVICE_MODE", "remote")
+TAG_CACHE_SIZE = int(os.environ.get("TAG_CACHE_SIZE", "4096"))
+TAG_SERVICE_MAX_WORKERS = int(os.environ.get("TAG_SERVICE_MAX_WORKERS", "16"))
+TAG_SERVICE_RETRIES = int(os.environ.get("TAG_SERVICE_RETRIES", "2"))
+TAG_SERVICE_TIMEOUT = float(os.environ.get("TAG_SERVICE_TIMEOUT", "5"))
+TAG_ROLLOVER_DAYS = (-1, 0, 3, 7, 28)
+
+logger = logging.getLogger(__name__)
+
+
+def create_tag_service_session(
+    pool_size: int = TAG_SERVICE_MAX_WORKERS,
+    retries: int = TAG_SERVICE_RETRIES,
+    backoff_factor: float = 0.1,
+) -> requests.Session:
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=None,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+tag_cache = TagCache(max_size=TAG_CACHE_SIZE)
+tag_service_session = create_tag_service_session()
+tag_service_executor = ThreadPoolExecutor(
+    max_workers=TAG_SERVICE_MAX_WORKERS, thread_name_prefix="tag-service"
+)
+
 
-from app.models import Priority, Task, TaskManager
+class FileLock:
 
-DEFAULT_TAG_SERVICE_URL = "http://localhost:8001/tag"
+    def __init__(self, file_path: str):
 
+        self.lock_path = f"{file_path}.lock"
+        self._thread_lock = threading.Lock()
+        self._lock_file = None
+
+    def acquire(self) -> None:
+
+        self._thread_lock.acquire()
+        if fcntl is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+            self._lock_file = open(self.lock_path, "a")
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        except OSError:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+            self._thread_lock.release()
+            raise
 
+    def release(self) -> None:
+
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+
+        self.release()
+
+
+@STAGE_LATENCY.time("load_tasks_from_file")
 def load_tasks_from_file(file_path: str) -> TaskManager:
 
     task_manager = TaskManager()
@@ -24,36 +121,162 @@ def load_tasks_from_file(file_path: str) -> TaskManager:
 
                 if data.get("tasks"):
                     task_ids = [task["id"] for task in data["tasks"]]
-                    task_manager.next_id = max(task_ids) + 1 if task_ids else 1
+                    task_manager.next_id = max(
+                        max(task_ids) + 1, data.get("next_id", 1)
+                    )
 
-                for task_data in data.get("tasks", []):
-                    task = Task.from_dict(task_data)
-                    task_manager.tasks[task.id] = task
+                task_manager.insert_tasks(
+                    [Task.from_dict(task_data) for task_data in data.get("tasks", [])]
+                )
         except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error loading tasks from {file_path}: {e}")
+            logger.error("Error loading tasks from %s: %s", file_path, e)
 
     return task_manager
 
 
+@STAGE_LATENCY.time("save_tasks_to_file")
 def save_tasks_to_file(task_manager: TaskManager, file_path: str) -> bool:
 
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
     try:
-        tasks_data = {
-            "tasks": [task.to_dict() for task in task_manager.list_tasks()],
-            "next_id": task_manager.next_id,
-        }
-
-        with open(file_path, "w") as f:
-            json.dump(tasks_data, f, indent=2)
+        tasks_json = b",\n    ".join(
+            task.to_json() for task in task_manager.list_tasks()
+        )
+        content = (
+            b'{\n  "tasks": [\n    '
+            + tasks_json
+            + b'\n  ],\n  "next_id": '
+            + str(task_manager.next_id).encode()
+            + b"\n}\n"
+        )
+
+        write_file_atomically(file_path, content)
 
         return True
     except (IOError, TypeError) as e:
-        print(f"Error saving tasks to {file_path}: {e}")
+        logger.error("Error saving tasks to %s: %s", file_path, e)
         return False
 
 
+def new_file_mode() -> int:
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+NEW_FILE_MODE = new_file_mode()
+
+
+def write_file_atomically(file_path: str, content: bytes) -> None:
+
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(file_path), prefix=".tasks-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            shutil.copymode(file_path, temp_path)
+        except FileNotFoundError:
+            os.chmod(temp_path, NEW_FILE_MODE)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def encode_cursor(order_by: TaskOrder, key: Any) -> str:
+
+    data = json.dumps({"order_by": order_by.value, "key": key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: TaskOrder) -> Any:
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = data["key"]
+        cursor_order = TaskOrder(data["order_by"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if cursor_order != order_by:
+        raise ValueError(f"Cursor was issued for order_by={cursor_order.value}")
+
+    if order_by == TaskOrder.DUE_DATE:
+        valid = (
+            isinstance(key, list)
+            and len(key) == 2
+            and isinstance(key[0], str)
+            and isinstance(key[1], int)
+        )
+    else:
+        valid = isinstance(key, int)
+    if not valid:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    return key
+
+
+def generate_embedded_tag(due_date: datetime, priority: Priority) -> str:
+
+    try:
+        return tag_cache.get_or_generate(due_date, priority.value)
+    except (TypeError, ValueError) as e:
+        logger.error("Error generating tag: %s", e)
+        return "Default Tag"
+
+
+@STAGE_LATENCY.time("tag_service")
+def _request_tag(
+    due_date: datetime, priority: Priority, tag_service_url: str
+) -> Optional[str]:
+
+    payload = {"due_date": due_date.isoformat(), "priority": priority.value}
+
+    logger.debug("Calling tag service with payload: %s", payload)
+
+    try:
+        response = tag_service_session.post(
+            tag_service_url, json=payload, timeout=TAG_SERVICE_TIMEOUT
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            tag = result.get("tag")
+            logger.debug("Tag service returned tag: %s", tag)
+            return tag
+        else:
+            logger.error(
+                "Tag service returned status code %s: %s",
+                response.status_code,
+                response.text,
+            )
+            return None
+
+    except RequestException as e:
+        logger.error("Error calling tag service: %s", e)
+        return None
+    except Exception:
+        logger.exception("Unexpected error in get_tag_for_task")
+        return None
+
+
+def _cache_tag(due_date: datetime, priority: Priority, tag: Optional[str]) -> str:
+
+    if tag is None:
+        return "Default Tag"
+
+    tag_cache.put(due_date, priority.value, tag)
+    return tag
+
+
 def get_tag_for_task(
     task_id: int,
     title: str,
@@ -63,66 +286,233 @@ def get_tag_for_task(
     tag_service_url: str = DEFAULT_TAG_SERVICE_URL,
 ) -> Optional[str]:
 
-    payload = {"due_date": due_date.isoformat(), "priority": priority.value}
+    if TAG_SERVICE_MODE == "embedded":
+        return generate_embedded_tag(due_date, priority)
+
+    cached_tag = tag_cache.get(due_date, priority.value)
+    if cached_tag is not None:
+        return cached_tag
+
+    tag = _request_tag(due_date, priority, tag_service_url)
+    return _cache_tag(due_date, priority, tag)
 
-    print(f"DEBUG: Calling tag service with payload: {payload}")
+
+async def get_tag_for_task_async(
+    task_id: int,
+    title: str,
+    description: str,
+    due_date: datetime,
+    priority: Priority,
+    tag_service_url: str = DEFAULT_TAG_SERVICE_URL,
+) -> Optional[str]:
+
+    return await get_tag_async(due_date, priority, tag_service_url=tag_service_url)
+
+
+async def get_tag_async(
+    due_date: datetime,
+    priority: Priority,
+    tag_service_url: str = DEFAULT_TAG_SERVICE_URL,
+) -> Optional[str]:
+
+    if TAG_SERVICE_MODE == "embedded":
+        return generate_embedded_tag(due_date, priority)
+
+    cached_tag = tag_cache.get(due_date, priority.value)
+    if cached_tag is not None:
+        return cached_tag
+
+    loop = asyncio.get_running_loop()
+    tag = await loop.run_in_executor(
+        tag_service_executor,
+        functools.partial(_request_tag, due_date, priority, tag_service_url),
+    )
+    return _cache_tag(due_date, priority, tag)
+
+
+@STAGE_LATENCY.time("tag_service_batch")
+def _request_tags(
+    tasks: List[Tuple[datetime, Priority]], tag_service_url: str
+) -> List[Optional[str]]:
+
+    payload = {
+        "tasks": [
+            {"due_date": due_date.isoformat(), "priority": priority.value}
+            for due_date, priority in tasks
+        ]
+    }
+
+    logger.debug("Calling batch tag service with %d tasks", len(tasks))
 
     try:
-        response = requests.post(tag_service_url, json=payload, timeout=5)
+        response = tag_service_session.post(
+            f"{tag_service_url}/batch", json=payload, timeout=TAG_SERVICE_TIMEOUT
+        )
 
         if response.status_code == 200:
-            result = response.json()
-            tag = result.get("tag")
-            print(f"DEBUG: Tag service returned tag: {tag}")
-            return tag
+            tags = response.json().get("tags")
+            if isinstance(tags, list) and len(tags) == len(tasks):
+                return tags
+            logger.error("Tag service returned an invalid batch: %s", response.text)
+            return [None] * len(tasks)
         else:
-            print(f"ERROR: Tag service returned status code {response.status_code}")
-            print(f"ERROR: Response text: {response.text}")
-            return "Default Tag"
+            logger.error(
+                "Tag service returned status code %s: %s",
+                response.status_code,
+                response.text,
+            )
+            return [None] * len(tasks)
 
     except RequestException as e:
-        print(f"ERROR: Error calling tag service: {e}")
-        return "Default Tag"
-    except Exception as e:
-        print(f"ERROR: Unexpected error in get_tag_for_task: {e}")
-        return "Default Tag"
+        logger.error("Error calling tag service: %s", e)
+        return [None] * len(tasks)
+    except Exception:
+        logger.exception("Unexpected error in get_tags_for_tasks")
+        return [None] * len(tasks)
+
+
+def _lookup_cached_tags(
+    tasks: List[Tuple[datetime, Priority]],
+) -> Tuple[List[Optional[str]], List[Tuple[datetime, Priority]]]:
+
+    tags = [tag_cache.get(due_date, priority.value) for due_date, priority in tasks]
+
+    missing = {}
+    for (due_date, priority), tag in zip(tasks, tags):
+        if tag is None:
+            key = tag_cache.key(due_date, priority.value)
+            missing.setdefault(key, (due_date, priority))
+
+    return tags, list(missing.values())
+
+
+def _merge_fetched_tags(
+    tasks: List[Tuple[datetime, Priority]],
+    tags: List[Optional[str]],
+    missing: List[Tuple[datetime, Priority]],
+    fetched: List[Optional[str]],
+) -> List[Optional[str]]:
+
+    fetched_by_key = {
+        tag_cache.key(due_date, priority.value): _cache_tag(due_date, priority, tag)
+        for (due_date, priority), tag in zip(missing, fetched)
+    }
+
+    return [
+        (
+            tag
+            if tag is not None
+            else fetched_by_key[tag_cache.key(due_date, priority.value)]
+        )
+        for (due_date, priority), tag in zip(tasks, tags)
+    ]
+
+
+def get_tags_for_tasks(
+    tasks: List[Tuple[datetime, Priority]],
+    tag_service_url: str = DEFAULT_TAG_SERVICE_URL,
+) -> List[Optional[str]]:
+
+    if not tasks:
+        return []
+
+    if TAG_SERVICE_MODE == "embedded":
+        return [
+            generate_embedded_tag(due_date, priority) for due_date, priority in tasks
+        ]
+
+    tags, missing = _lookup_cached_tags(tasks)
+    if not missing:
+        return tags
+
+    fetched = _request_tags(missing, tag_service_url)
+    return _merge_fetched_tags(tasks, tags, missing, fetched)
+
+
+async def get_tags_for_tasks_async(
+    tasks: List[Tuple[datetime, Priority]],
+    tag_service_url: str = DEFAULT_TAG_SERVICE_URL,
+) -> List[Optional[str]]:
+
+    if not tasks or TAG_SERVICE_MODE == "embedded":
+        return get_tags_for_tasks(tasks, tag_service_url=tag_service_url)
+
+    tags, missing = _lookup_cached_tags(tasks)
+    if not missing:
+        return tags
+
+    loop = asyncio.get_running_loop()
+    fetched = await loop.run_in_executor(
+        tag_service_executor,
+        functools.partial(_request_tags, missing, tag_service_url),
+    )
+    return _merge_fetched_tags(tasks, tags, missing, fetched)
 
 
 def compare_and_update_priority(
-    task_manager: TaskManager, reference_date: datetime, new_priority: Priority
+    task_manager: BaseTaskManager, reference_date: datetime, new_priority: Priority
 ) -> List[Task]:
 
     updated_tasks = []
     ref_date = reference_date.date()
 
-    print(
-        f"DEBUG: compare_and_update_priority called with reference_date={ref_date}, new_priority={new_priority.value}"
+    logger.debug(
+        "compare_and_update_priority called with reference_date=%s, new_priority=%s",
+        ref_date,
+        new_priority.value,
     )
 
-    for task in task_manager.list_tasks():
-        task_date = task.due_date.date()
-        print(f"DEBUG: Checking task (id={task.id}) with due_date={task_date}")
+    matching_tasks = [
+        task_manager.update_task(task.id, priority=new_priority)
+        for task in task_manager.tasks_due_on(ref_date)
+    ]
 
-        if task_date == ref_date:
-            print(f"DEBUG: Found matching task with id={task.id}")
+    tags = get_tags_for_tasks(
+        [(task.due_date, new_priority) for task in matching_tasks]
+    )
 
-            task.priority = new_priority
+    for task, tag in zip(matching_tasks, tags):
+        if tag:
+            task = task_manager.update_task(task.id, tag=tag)
+            logger.debug("Updated task (id=%s) with tag=%s", task.id, tag)
+        else:
+            logger.error("Failed to get tag for task (id=%s)", task.id)
 
-            tag = get_tag_for_task(
-                task_id=task.id,
-                title=task.title,
-                description=task.description,
-                due_date=task.due_date,
-                priority=new_priority,
-            )
+        updated_tasks.append(task)
 
-            if tag:
-                task.tag = tag
-                print(f"DEBUG: Updated task (id={task.id}) with tag={tag}")
-            else:
-                print(f"ERROR: Failed to get tag for task (id={task.id})")
+    logger.debug("Updated %d tasks", len(updated_tasks))
+    return updated_tasks
 
-            updated_tasks.append(task)
 
-    print(f"DEBUG: Updated {len(updated_tasks)} tasks")
-    return updated_tasks
+def retag_tasks(task_manager: BaseTaskManager, today: Optional[date] = None) -> int:
+
+    if today is None:
+        today = datetime.now().date()
+
+    stale_tags = task_manager.stale_tags(today)
+    return task_manager.set_tags(stale_tags)
+
+
+def retag_tasks_due_on(
+    task_manager: BaseTaskManager, due_dates: Iterable[date], today: date
+) -> int:
+
+    tasks = [
+        task for due_date in due_dates for task in task_manager.tasks_due_on(due_date)
+    ]
+    tags = generate_tags(
+        [(task.due_date.date() - today).days for task in tasks],
+        [task.priority.value for task in tasks],
+    )
+
+    stale_tags = [(task.id, tag) for task, tag in zip(tasks, tags) if tag != task.tag]
+    return task_manager.set_tags(stale_tags)
+
+
+def roll_over_tags(task_manager: BaseTaskManager, today: Optional[date] = None) -> int:
+
+    if today is None:
+        today = datetime.now().date()
+
+    due_dates = [today + timedelta(days=offset) for offset in TAG_ROLLOVER_DAYS]
+    return retag_tasks_due_on(task_manager, due_dates, today)
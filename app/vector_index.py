@@ -0,0 +1,263 @@
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from tag_server.rules import (
+    PRIORITY_CODES,
+    PRIORITY_NAMES,
+    TAG_NAMES,
+    generate_tag_codes,
+)
+
+VECTOR_INDEX_THRESHOLD = int(os.environ.get("VECTOR_INDEX_THRESHOLD", "50000"))
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+DAY_MICROSECONDS = 86400 * 1000000
+
+
+def vector_index_available() -> bool:
+
+    return np is not None
+
+
+def wall_clock_microseconds(value: datetime) -> int:
+
+    seconds = value.hour * 3600 + value.minute * 60 + value.second
+    days = value.toordinal() - EPOCH_ORDINAL
+    return (days * 86400 + seconds) * 1000000 + value.microsecond
+
+
+class VectorTaskIndex:
+
+    def __init__(self, capacity: int = 1024):
+
+        if np is None:
+            raise RuntimeError("VectorTaskIndex requires numpy")
+
+        self.size = 0
+        self.dead = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.due = np.zeros(capacity, dtype=np.int64)
+        self.priority = np.zeros(capacity, dtype=np.int8)
+        self.completed = np.zeros(capacity, dtype=bool)
+        self.tag = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.tag_names: List[Optional[str]] = [None]
+        self.tag_codes: Dict[Optional[str], int] = {None: 0}
+        self._rows: Dict[int, int] = {}
+
+    @classmethod
+    def from_columns(
+        cls,
+        task_ids: List[int],
+        due_dates: List[datetime],
+        priorities: List[str],
+        completed: List[bool],
+        tags: List[Optional[str]],
+    ) -> "VectorTaskIndex":
+
+        size = len(task_ids)
+        index = cls(capacity=max(size * 2, 1024))
+        index.size = size
+        index.ids[:size] = np.fromiter(task_ids, dtype=np.int64, count=size)
+        index.due[:size] = np.fromiter(
+            map(wall_clock_microseconds, due_dates), dtype=np.int64, count=size
+        )
+        index.priority[:size] = np.fromiter(
+            map(PRIORITY_CODES.__getitem__, priorities), dtype=np.int8, count=size
+        )
+        index.completed[:size] = np.fromiter(completed, dtype=bool, count=size)
+        index.tag[:size] = np.fromiter(
+            map(index._tag_code, tags), dtype=np.int32, count=size
+        )
+        index.alive[:size] = True
+        index._rows = dict(zip(task_ids, range(size)))
+        return index
+
+    def _grow(self, capacity: int) -> None:
+
+        for name in ("ids", "due", "priority", "completed", "tag", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    def _tag_code(self, tag: Optional[str]) -> int:
+
+        code = self.tag_codes.get(tag)
+        if code is None:
+            code = len(self.tag_names)
+            self.tag_names.append(tag)
+            self.tag_codes[tag] = code
+        return code
+
+    def upsert(
+        self,
+        task_id: int,
+        due_date: datetime,
+        priority: str,
+        completed: bool,
+        tag: Optional[str],
+    ) -> None:
+
+        row = self._rows.get(task_id)
+        if row is None:
+            if self.size == len(self.ids):
+                self._grow(len(self.ids) * 2)
+            row = self.size
+            self.size += 1
+            self._rows[task_id] = row
+            self.ids[row] = task_id
+            self.alive[row] = True
+
+        self.due[row] = wall_clock_microseconds(due_date)
+        self.priority[row] = PRIORITY_CODES[priority]
+        self.completed[row] = completed
+        self.tag[row] = self._tag_code(tag)
+
+    def set_completed(self, task_id: int, completed: bool) -> None:
+
+        row = self._rows.get(task_id)
+        if row is not None:
+            self.completed[row] = completed
+
+    def set_tag(self, task_id: int, tag: Optional[str]) -> None:
+
+        row = self._rows.get(task_id)
+        if row is not None:
+            self.tag[row] = self._tag_code(tag)
+
+    def remove(self, task_id: int) -> None:
+
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+
+        self.alive[row] = False
+        self.dead += 1
+        if self.dead > 1024 and self.dead * 2 > self.size:
+            self.compact()
+
+    def compact(self) -> None:
+
+        keep = np.flatnonzero(self.alive[: self.size])
+        for name in ("ids", "due", "priority", "completed", "tag", "alive"):
+            column = getattr(self, name)
+            compacted = np.zeros(max(len(keep) * 2, 1024), dtype=column.dtype)
+            compacted[: len(keep)] = column[keep]
+            setattr(self, name, compacted)
+
+        self.size = len(keep)
+        self.dead = 0
+        self._rows = {
+            task_id: row for row, task_id in enumerate(self.ids[: self.size].tolist())
+        }
+
+    def mask(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        due_from: Optional[datetime] = None,
+        due_to: Optional[datetime] = None,
+        tag: Optional[str] = None,
+    ):
+
+        mask = self.alive[: self.size].copy()
+
+        if completed is not None:
+            mask &= self.completed[: self.size] == completed
+        if priority is not None:
+            mask &= self.priority[: self.size] == PRIORITY_CODES[priority]
+        if due_from is not None:
+            mask &= self.due[: self.size] >= wall_clock_microseconds(due_from)
+        if due_to is not None:
+            mask &= self.due[: self.size] < wall_clock_microseconds(due_to)
+        if tag is not None:
+            code = self.tag_codes.get(tag)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.tag[: self.size] == code
+
+        return mask
+
+    def query_ids(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        due_from: Optional[datetime] = None,
+        due_to: Optional[datetime] = None,
+        tag: Optional[str] = None,
+    ) -> List[int]:
+
+        mask = self.mask(completed, priority, due_from, due_to, tag)
+        return np.sort(self.ids[: self.size][mask]).tolist()
+
+    def page_ids(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        by_due_date: bool = False,
+        after_due: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> List[int]:
+
+        mask = self.mask(completed, priority)
+        ids = self.ids[: self.size]
+
+        if by_due_date:
+            due = self.due[: self.size]
+            if after_due is not None:
+                after_micros = wall_clock_microseconds(after_due)
+                later = (due == after_micros) & (ids > after_id)
+                mask &= (due > after_micros) | later
+            rows = np.flatnonzero(mask)
+            order = np.lexsort((ids[rows], due[rows]))[:count]
+            return ids[rows[order]].tolist()
+
+        if after_id is not None:
+            mask &= ids > after_id
+        selected = ids[mask]
+        if count is not None and count < len(selected):
+            selected = np.partition(selected, count - 1)[:count]
+        return np.sort(selected).tolist()
+
+    def count_by_priority(self, completed: Optional[bool] = None) -> Dict[str, int]:
+
+        mask = self.mask(completed=completed)
+        counts = np.bincount(
+            self.priority[: self.size][mask], minlength=len(PRIORITY_NAMES)
+        )
+        return {name: int(counts[code]) for code, name in enumerate(PRIORITY_NAMES)}
+
+    def count_by_tag(
+        self, completed: Optional[bool] = None
+    ) -> Dict[Optional[str], int]:
+
+        mask = self.mask(completed=completed)
+        counts = np.bincount(self.tag[: self.size][mask], minlength=len(self.tag_names))
+        return {
+            self.tag_names[code]: int(count)
+            for code, count in enumerate(counts)
+            if count
+        }
+
+    def stale_tags(self, today: date) -> Tuple[List[int], List[str]]:
+
+        rows = np.flatnonzero(self.alive[: self.size])
+        today_days = (today - EPOCH.date()).days
+        days_remaining = self.due[rows] // DAY_MICROSECONDS - today_days
+        tag_codes = generate_tag_codes(days_remaining, self.priority[rows])
+
+        current_codes = np.array([self.tag_codes.get(tag, -1) for tag in TAG_NAMES])
+        changed = current_codes[tag_codes] != self.tag[rows]
+
+        tags = np.array(TAG_NAMES, dtype=object)[tag_codes[changed]]
+        return self.ids[rows][changed].tolist(), tags.tolist()
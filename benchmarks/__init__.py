@@ -0,0 +1,6 @@
+"""
+Smart Task Manager benchmarks.
+
+Run the individual scripts from the repository root, e.g.
+``python -m benchmarks.serialization``.
+"""
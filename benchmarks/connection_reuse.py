@@ -0,0 +1,77 @@
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import requests
+import uvicorn
+
+from app.utils import create_tag_service_session
+from tag_server.main import app as tag_server_app
+
+
+def start_tag_server(port: int) -> uvicorn.Server:
+
+    server = uvicorn.Server(
+        uvicorn.Config(tag_server_app, port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def time_calls(post: Callable, url: str, calls: int) -> float:
+
+    due_date = datetime.now() + timedelta(days=3)
+    payload = {"due_date": due_date.isoformat(), "priority": "Medium"}
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        response = post(url, json=payload, timeout=5)
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compare tag service calls with and without connection reuse"
+    )
+    parser.add_argument("--calls", type=int, default=1000, help="Sequential calls")
+    parser.add_argument(
+        "--url",
+        help="Tag endpoint to call; by default a tag server is started in-process",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8011, help="Port for the in-process tag server"
+    )
+
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = start_tag_server(args.port)
+        url = f"http://127.0.0.1:{args.port}/tag"
+
+    session = create_tag_service_session()
+    try:
+        time_calls(session.post, url, 10)
+
+        fresh = time_calls(requests.post, url, args.calls)
+        pooled = time_calls(session.post, url, args.calls)
+    finally:
+        session.close()
+        if server is not None:
+            server.should_exit = True
+
+    print(f"{'mode':>12} {'total (s)':>10} {'per call (ms)':>14}")
+    for mode, elapsed in (("new conn", fresh), ("keep-alive", pooled)):
+        print(f"{mode:>12} {elapsed:>10.3f} {elapsed / args.calls * 1000:>14.3f}")
+    print(f"speedup: {fresh / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
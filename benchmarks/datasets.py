@@ -0,0 +1,34 @@
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from app.models import Priority, Task, TaskManager
+from app.utils import save_tasks_to_file
+
+
+def generate_tasks(count: int, seed: int = 42) -> List[Task]:
+
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    priorities = list(Priority)
+
+    return [
+        Task(
+            task_id=task_id,
+            title=f"Task {task_id}",
+            description=f"Synthetic task number {task_id}",
+            due_date=start + timedelta(minutes=rng.randint(0, 525600)),
+            priority=rng.choice(priorities),
+            completed=rng.random() < 0.3,
+            tag=rng.choice(["Overdue", "Urgent", "High priority", "Medium", None]),
+        )
+        for task_id in range(1, count + 1)
+    ]
+
+
+def write_dataset(file_path: str, count: int, seed: int = 42) -> None:
+
+    task_manager = TaskManager()
+    task_manager.insert_tasks(generate_tasks(count, seed))
+    task_manager.next_id = count + 1
+    save_tasks_to_file(task_manager, file_path)
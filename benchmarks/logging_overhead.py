@@ -0,0 +1,91 @@
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.logging_config import LOG_FORMAT, configure_logging, shutdown_logging
+
+
+def time_requests(client, task_id: int, count: int) -> float:
+
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.post("/tagger", json={"task_id": task_id})
+        response.raise_for_status()
+    return (time.perf_counter() - start) / count
+
+
+def use_queue_handler(level: str, stream) -> None:
+
+    shutdown_logging()
+    configure_logging(level, stream=stream)
+
+
+def use_direct_handler(level: str, stream) -> None:
+
+    shutdown_logging()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger = logging.getLogger("app")
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Measure per-request overhead of debug logging on POST /tagger"
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="logging-bench-")
+    os.environ["TASKS_FILE"] = os.path.join(data_dir, "tasks.json")
+    os.environ["TASK_STORAGE_BACKEND"] = "journal"
+    os.environ["TAG_SERVICE_MODE"] = "embedded"
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    try:
+        with open(os.path.join(data_dir, "app.log"), "w") as log_file:
+            with TestClient(app) as client:
+                task = client.post(
+                    "/tasks",
+                    json={
+                        "title": "Benchmark",
+                        "description": "Logging overhead",
+                        "due_date": (datetime.now() + timedelta(days=3)).isoformat(),
+                        "priority": "Medium",
+                    },
+                ).json()
+                time_requests(client, task["id"], 100)
+
+                results = []
+                for mode, use_handler, level in (
+                    ("debug off", use_queue_handler, "INFO"),
+                    ("debug, queue", use_queue_handler, "DEBUG"),
+                    ("debug, direct", use_direct_handler, "DEBUG"),
+                ):
+                    use_handler(level, log_file)
+                    elapsed = time_requests(client, task["id"], args.requests)
+                    results.append((mode, elapsed))
+
+                logging.getLogger("app").handlers = []
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    baseline = results[0][1]
+    print(f"{'mode':>14} {'per request (us)':>17} {'overhead (us)':>14}")
+    for mode, elapsed in results:
+        print(f"{mode:>14} {elapsed * 1e6:>17.1f} {(elapsed - baseline) * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
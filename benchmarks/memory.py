@@ -0,0 +1,81 @@
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Optional, Union
+
+from app.models import Priority, Task
+from benchmarks.datasets import generate_tasks
+
+
+class DictTask:
+
+    def __init__(
+        self,
+        task_id: int,
+        title: str,
+        description: str,
+        due_date: datetime,
+        priority: Priority,
+        completed: bool = False,
+        tag: Optional[str] = None,
+    ):
+
+        self.id = task_id
+        self.title = title
+        self.description = description
+        self.due_date = due_date
+        self.priority = priority
+        self.completed = completed
+        self.tag = tag
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Union[int, str, bool]]) -> "DictTask":
+
+        return cls(
+            task_id=data["id"],
+            title=data["title"],
+            description=data["description"],
+            due_date=datetime.fromisoformat(data["due_date"]),
+            priority=Priority(data["priority"]),
+            completed=data["completed"],
+            tag=data.get("tag"),
+        )
+
+
+def bytes_per_task(task_class: Callable, tasks_json: str, count: int) -> float:
+
+    gc.collect()
+    tracemalloc.start()
+    tasks = [task_class.from_dict(data) for data in json.loads(tasks_json)["tasks"]]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del tasks
+    return current / count
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Measure memory used per task")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100000], help="Task counts"
+    )
+
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'dict (B/task)':>14} {'slots (B/task)':>15} {'saved':>7}")
+    for size in args.sizes:
+        tasks_json = json.dumps(
+            {"tasks": [task.to_dict() for task in generate_tasks(size)]}
+        )
+
+        before = bytes_per_task(DictTask, tasks_json, size)
+        after = bytes_per_task(Task, tasks_json, size)
+        print(f"{size:>8} {before:>14.0f} {after:>15.0f} {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
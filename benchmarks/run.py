@@ -0,0 +1,381 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+STUB_TAG = "Medium"
+COMPARED_META = ("backend", "sizes", "requests", "seed")
+
+
+class StubTagHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/batch"):
+            payload = {"tags": [STUB_TAG] * len(body.get("tasks", []))}
+        else:
+            payload = {"tag": STUB_TAG}
+
+        content = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+
+        pass
+
+
+def start_stub_tag_server() -> ThreadingHTTPServer:
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTagHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_summary(timings: List[float]) -> Dict[str, float]:
+
+    total = sum(timings)
+    return {
+        "requests": len(timings),
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p50_ms": percentile(timings, 0.50) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "throughput_rps": len(timings) / total if total else 0.0,
+    }
+
+
+def measure_storage(
+    dataset_path: str, work_dir: str, size: int, repeat: int
+) -> Dict[str, float]:
+
+    from app.models import Priority
+    from app.utils import load_tasks_from_file, retag_tasks, save_tasks_to_file
+
+    results = {}
+
+    results["load_tasks_from_file_s"] = best_of(
+        lambda: load_tasks_from_file(dataset_path), repeat
+    )
+    task_manager = load_tasks_from_file(dataset_path)
+
+    save_path = os.path.join(work_dir, "saved.json")
+    results["save_tasks_to_file_s"] = best_of(
+        lambda: save_tasks_to_file(task_manager, save_path), repeat
+    )
+
+    results["filter_incomplete_high_s"] = best_of(
+        lambda: task_manager.filter_tasks(completed=False, priority=Priority.HIGH),
+        repeat,
+    )
+    results["filter_low_s"] = best_of(
+        lambda: task_manager.filter_tasks(priority=Priority.LOW), repeat
+    )
+    results["tasks_due_on_s"] = best_of(
+        lambda: task_manager.tasks_due_on(date(2025, 6, 1)), repeat
+    )
+    results["count_tasks_s"] = best_of(lambda: task_manager.count_tasks(), repeat)
+
+    bulk_ids = list(range(1, size + 1, 10))
+
+    def complete_and_restore() -> None:
+
+        task_manager.mark_tasks_complete(bulk_ids)
+        task_manager.mark_tasks_incomplete(bulk_ids)
+        task_manager.drain_changes()
+
+    results["bulk_complete_incomplete_s"] = best_of(complete_and_restore, repeat)
+
+    retag_days = iter(range(0, 365 * repeat, 7))
+
+    def retag() -> None:
+
+        retag_tasks(task_manager, date(2025, 1, 1) + timedelta(days=next(retag_days)))
+        task_manager.drain_changes()
+
+    results["retag_all_s"] = best_of(retag, repeat)
+
+    start = time.perf_counter()
+    task_manager.delete_tasks(bulk_ids)
+    results["bulk_delete_s"] = time.perf_counter() - start
+
+    return results
+
+
+def time_requests(send: Callable[[int], Any], count: int) -> Dict[str, float]:
+
+    timings = []
+    for index in range(count):
+        start = time.perf_counter()
+        response = send(index)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return latency_summary(timings)
+
+
+def measure_endpoints(
+    dataset_path: str, backend: str, size: int, requests: int
+) -> Dict[str, Dict[str, float]]:
+
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.storage import import_json_to_sqlite
+
+    task_storage = main.task_storage
+    task_storage.close()
+    if backend == "sqlite":
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(main.TASKS_DB_FILE + suffix):
+                os.remove(main.TASKS_DB_FILE + suffix)
+        import_json_to_sqlite(dataset_path, main.TASKS_DB_FILE)
+    else:
+        if os.path.exists(main.TASKS_FILE + ".journal"):
+            os.remove(main.TASKS_FILE + ".journal")
+        shutil.copyfile(dataset_path, main.TASKS_FILE)
+
+    new_task = {
+        "title": "Benchmark task",
+        "description": "Created by the benchmark suite",
+        "due_date": (datetime.now() + timedelta(days=5)).isoformat(),
+        "priority": "Medium",
+        "completed": False,
+    }
+
+    results = {}
+    with TestClient(main.app) as client:
+        client.post("/tasks", json=new_task).raise_for_status()
+        time_requests(lambda index: client.get("/tasks", params={"limit": 100}), 10)
+
+        results["GET /tasks?limit=100"] = time_requests(
+            lambda index: client.get("/tasks", params={"limit": 100}), requests
+        )
+        results["GET /tasks?completed=false&priority=High"] = time_requests(
+            lambda index: client.get(
+                "/tasks", params={"completed": "false", "priority": "High"}
+            ),
+            max(1, requests // 10),
+        )
+        results["GET /tasks/{task_id}"] = time_requests(
+            lambda index: client.get(f"/tasks/{index % size + 1}"), requests
+        )
+        results["GET /tasks/stats"] = time_requests(
+            lambda index: client.get("/tasks/stats"), max(1, requests // 10)
+        )
+        results["POST /tasks"] = time_requests(
+            lambda index: client.post("/tasks", json=new_task), requests
+        )
+        results["PUT /tasks/{task_id}"] = time_requests(
+            lambda index: client.put(
+                f"/tasks/{index % size + 1}", json={"priority": "High"}
+            ),
+            requests,
+        )
+        results["POST /tasks/batch"] = time_requests(
+            lambda index: client.post("/tasks/batch", json={"tasks": [new_task] * 50}),
+            max(1, requests // 10),
+        )
+
+    return results
+
+
+def flatten(results: List[Dict[str, Any]]) -> Dict[str, float]:
+
+    flat = {}
+    for result in results:
+        prefix = f"{result['size']}"
+        for name, value in result["storage"].items():
+            flat[f"{prefix}/storage/{name}"] = value
+        for endpoint, summary in result.get("endpoints", {}).items():
+            flat[f"{prefix}/endpoints/{endpoint}/p50_ms"] = summary["p50_ms"]
+            flat[f"{prefix}/endpoints/{endpoint}/p95_ms"] = summary["p95_ms"]
+    return flat
+
+
+def compare(report: Dict[str, Any], baseline_path: str, threshold: float) -> List[str]:
+
+    with open(baseline_path, "r") as f:
+        baseline_report = json.load(f)
+
+    mismatches = [
+        f"{key} {baseline_report['meta'].get(key)!r} != {report['meta'][key]!r}"
+        for key in COMPARED_META
+        if baseline_report["meta"].get(key) != report["meta"][key]
+    ]
+    if mismatches:
+        raise ValueError(
+            f"{baseline_path} was recorded with different settings: "
+            + ", ".join(mismatches)
+        )
+
+    baseline = flatten(baseline_report["results"])
+    regressions = []
+    for key, value in flatten(report["results"]).items():
+        previous = baseline.get(key)
+        if previous and value > previous * (1 + threshold):
+            regressions.append(
+                f"{key}: {previous:.4g} -> {value:.4g} (+{value / previous - 1:.0%})"
+            )
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark storage operations and API endpoints"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Task counts"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per endpoint"
+    )
+    parser.add_argument(
+        "--endpoint-max-size",
+        type=int,
+        default=100000,
+        help="Largest dataset to run endpoint benchmarks against",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["json", "journal", "sqlite"],
+        default="json",
+        help="Storage backend used by the endpoint benchmarks",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Dataset random seed")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Slowdown fraction reported as a regression",
+    )
+
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="task-bench-")
+    stub_server = start_stub_tag_server()
+
+    os.environ["TASKS_FILE"] = os.path.join(work_dir, "api", "tasks.json")
+    os.environ["TASKS_DB_FILE"] = os.path.join(work_dir, "api", "tasks.db")
+    os.environ["TASK_STORAGE_BACKEND"] = args.backend
+    os.environ["TAG_SERVICE_MODE"] = "remote"
+    os.environ["TAG_SERVICE_URL"] = f"http://127.0.0.1:{stub_server.server_port}/tag"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.makedirs(os.path.dirname(os.environ["TASKS_FILE"]), exist_ok=True)
+
+    from benchmarks.datasets import write_dataset
+
+    results = []
+    try:
+        for size in args.sizes:
+            dataset_path = os.path.join(work_dir, f"tasks-{size}.json")
+            print(f"Generating {size} tasks", file=sys.stderr)
+            write_dataset(dataset_path, size, seed=args.seed)
+
+            print(f"Measuring storage with {size} tasks", file=sys.stderr)
+            result = {
+                "size": size,
+                "dataset_bytes": os.path.getsize(dataset_path),
+                "storage": measure_storage(dataset_path, work_dir, size, args.repeat),
+            }
+
+            if size <= args.endpoint_max_size:
+                print(f"Measuring endpoints with {size} tasks", file=sys.stderr)
+                result["endpoints"] = measure_endpoints(
+                    dataset_path, args.backend, size, args.requests
+                )
+
+            results.append(result)
+            os.remove(dataset_path)
+    finally:
+        stub_server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        try:
+            regressions = compare(report, args.baseline, args.threshold)
+        except ValueError as e:
+            print(f"Not comparing against baseline: {e}", file=sys.stderr)
+            sys.exit(2)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable, List
+
+from fastapi.routing import APIRoute, serialize_response
+from starlette.responses import JSONResponse
+
+from app.main import app
+from app.models import Task
+from app.schemas import TaskListResponse, TaskResponse
+from app.serialization import task_page_response
+from benchmarks.datasets import generate_tasks
+
+
+def pydantic_path(tasks: List[Task]) -> bytes:
+
+    route = next(
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path == "/tasks"
+        and "GET" in route.methods
+    )
+
+    task_responses = []
+    for task in tasks:
+
+        tag = task.tag if task.tag is not None else ""
+
+        task_responses.append(
+            TaskResponse(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                due_date=task.due_date,
+                priority=task.priority,
+                completed=task.completed,
+                tag=tag,
+            )
+        )
+
+    content = TaskListResponse(tasks=task_responses, count=len(task_responses))
+    encoded = asyncio.run(
+        serialize_response(field=route.response_field, response_content=content)
+    )
+    return JSONResponse(encoded).body
+
+
+def fast_path(tasks: List[Task]) -> bytes:
+
+    return task_page_response(tasks).body
+
+
+def best_of(
+    func: Callable[[List[Task]], bytes], tasks: List[Task], repeat: int
+) -> float:
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(tasks)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compare GET /tasks serialization paths"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000], help="Task counts"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'pydantic (s)':>14} {'fast (s)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        tasks = generate_tasks(size)
+
+        assert json.loads(pydantic_path(tasks[:100])) == json.loads(
+            fast_path(tasks[:100])
+        )
+
+        slow = best_of(pydantic_path, tasks, args.repeat)
+        fast = best_of(fast_path, tasks, args.repeat)
+        print(f"{size:>8} {slow:>14.3f} {fast:>10.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
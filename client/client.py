@@ -1,18 +1,115 @@
 import argparse
+import asyncio
+import functools
 import json
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+TASK_CREATE_FIELDS = ("title", "description", "due_date", "priority", "completed")
+DEFAULT_CHUNK_SIZE = 1000
+BENCH_OPERATIONS = ("create", "read", "filter", "update", "bulk")
+DEFAULT_BENCH_MIX = "create=20,read=40,filter=20,update=15,bulk=5"
+PRIORITIES = ("Low", "Medium", "High")
+REQUEST_ERRORS = (
+    (RequestException,) if httpx is None else (RequestException, httpx.HTTPError)
+)
+
+
+def create_session(
+    pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.3
+) -> requests.Session:
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def split_chunks(items: List[Any], chunk_size: int) -> List[List[Any]]:
+
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def merge_task_lists(responses: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+
+    return [task for response in responses for task in response]
+
+
+def merge_delete_results(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+    deleted_count = sum(response.get("deleted", 0) for response in responses)
+    return {"message": f"Deleted {deleted_count} tasks", "deleted": deleted_count}
 
 
 class TaskManagerClient:
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        timeout: float = 10,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_concurrency: int = 1,
+    ):
 
         self.base_url = base_url
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.chunk_concurrency = chunk_concurrency
+        self.session = create_session(pool_size, retries, backoff_factor)
+
+    def close(self) -> None:
+
+        self.session.close()
+
+    def __enter__(self) -> "TaskManagerClient":
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+
+        self.close()
 
     def _make_request(
         self,
@@ -26,13 +123,13 @@ class TaskManagerClient:
 
         try:
             if method == "GET":
-                response = requests.get(url, params=params)
+                response = self.session.get(url, params=params, timeout=self.timeout)
             elif method == "POST":
-                response = requests.post(url, json=data)
+                response = self.session.post(url, json=data, timeout=self.timeout)
             elif method == "PUT":
-                response = requests.put(url, json=data)
+                response = self.session.put(url, json=data, timeout=self.timeout)
             elif method == "DELETE":
-                response = requests.delete(url)
+                response = self.session.delete(url, timeout=self.timeout)
             else:
                 raise ValueError(f"Invalid HTTP method: {method}")
 
@@ -87,6 +184,78 @@ class TaskManagerClient:
 
         return response.get("tasks", [])
 
+    def get_tasks_page(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+
+        params = {}
+        if completed is not None:
+            params["completed"] = completed
+        if priority is not None:
+            params["priority"] = priority
+        if limit is not None:
+            params["limit"] = limit
+        if cursor is not None:
+            params["cursor"] = cursor
+        if order_by is not None:
+            params["order_by"] = order_by
+
+        return self._make_request("GET", "/tasks", params=params)
+
+    def iter_tasks(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        page_size: int = 100,
+        order_by: str = "id",
+    ) -> Iterator[Dict[str, Any]]:
+
+        cursor = None
+        while True:
+            page = self.get_tasks_page(
+                completed=completed,
+                priority=priority,
+                limit=page_size,
+                cursor=cursor,
+                order_by=order_by,
+            )
+            yield from page.get("tasks", [])
+
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
+    def stream_tasks(
+        self, completed: Optional[bool] = None, priority: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+
+        url = f"{self.base_url}/tasks/stream"
+
+        params = {}
+        if completed is not None:
+            params["completed"] = completed
+        if priority is not None:
+            params["priority"] = priority
+
+        try:
+            with self.session.get(
+                url, params=params, stream=True, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+
+        except RequestException as e:
+            print(f"Error making request to {url}: {e}")
+            raise
+
     def get_task(self, task_id: int) -> Dict[str, Any]:
 
         return self._make_request("GET", f"/tasks/{task_id}")
@@ -122,20 +291,32 @@ class TaskManagerClient:
 
         return self._make_request("DELETE", f"/tasks/{task_id}")
 
+    def _post_chunks(self, endpoint: str, key: str, items: List[Any]) -> List[Any]:
+
+        def send(chunk: List[Any]) -> Any:
+
+            return self._make_request("POST", endpoint, data={key: chunk})
+
+        chunks = split_chunks(items, self.chunk_size)
+        if self.chunk_concurrency > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.chunk_concurrency) as executor:
+                return list(executor.map(send, chunks))
+        return [send(chunk) for chunk in chunks]
+
     def mark_tasks_complete(self, task_ids: List[int]) -> List[Dict[str, Any]]:
 
-        data = {"task_ids": task_ids}
-        return self._make_request("POST", "/tasks/complete", data=data)
+        responses = self._post_chunks("/tasks/complete", "task_ids", task_ids)
+        return merge_task_lists(responses)
 
     def mark_tasks_incomplete(self, task_ids: List[int]) -> List[Dict[str, Any]]:
 
-        data = {"task_ids": task_ids}
-        return self._make_request("POST", "/tasks/incomplete", data=data)
+        responses = self._post_chunks("/tasks/incomplete", "task_ids", task_ids)
+        return merge_task_lists(responses)
 
     def delete_tasks(self, task_ids: List[int]) -> Dict[str, Any]:
 
-        data = {"task_ids": task_ids}
-        return self._make_request("POST", "/tasks/delete", data=data)
+        responses = self._post_chunks("/tasks/delete", "task_ids", task_ids)
+        return merge_delete_results(responses)
 
     def create_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
@@ -146,9 +327,8 @@ class TaskManagerClient:
                 processed_task["due_date"] = processed_task["due_date"].isoformat()
             processed_tasks.append(processed_task)
 
-        batch_data = {"tasks": processed_tasks}
-
-        return self._make_request("POST", "/tasks/batch", data=batch_data)
+        responses = self._post_chunks("/tasks/batch", "tasks", processed_tasks)
+        return merge_task_lists(responses)
 
     def update_priorities_by_due_date(
         self, due_date: Union[str, datetime], priority: str
@@ -161,12 +341,326 @@ class TaskManagerClient:
 
         return self._make_request("POST", "/tagger", data=tagger_data)
 
+    def retag_tasks(self) -> Dict[str, Any]:
+
+        return self._make_request("POST", "/tasks/retag")
+
     def update_task_tag(self, task_id: int) -> Dict[str, Any]:
 
         data = {"task_id": task_id}
         return self._make_request("POST", "/tagger", data=data)
 
 
+def task_fields(task: Dict[str, Any]) -> Dict[str, Any]:
+
+    return {field: task[field] for field in TASK_CREATE_FIELDS if field in task}
+
+
+class FanOutResult:
+
+    def __init__(self, count: int):
+
+        self.results: List[Any] = [None] * count
+        self.errors: List[Tuple[int, Exception]] = []
+
+    @property
+    def succeeded(self) -> int:
+
+        return len(self.results) - len(self.errors)
+
+
+async def fan_out(
+    operations: List[Callable[[], Awaitable[Any]]], concurrency: int = 64
+) -> FanOutResult:
+
+    result = FanOutResult(len(operations))
+    pending = iter(enumerate(operations))
+
+    async def worker() -> None:
+
+        for index, operation in pending:
+            try:
+                result.results[index] = await operation()
+            except Exception as e:
+                result.errors.append((index, e))
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    result.errors.sort(key=lambda error: error[0])
+    return result
+
+
+class AsyncTaskManagerClient:
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        pool_size: int = 64,
+        retries: int = 3,
+        timeout: float = 10,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_concurrency: int = 1,
+    ):
+
+        if httpx is None:
+            raise RuntimeError("AsyncTaskManagerClient requires httpx")
+
+        self.base_url = base_url
+        self.chunk_size = chunk_size
+        self.chunk_concurrency = chunk_concurrency
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=retries),
+        )
+
+    async def close(self) -> None:
+
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncTaskManagerClient":
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+
+        await self.close()
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Invalid HTTP method: {method}")
+
+        response = await self.client.request(method, endpoint, json=data, params=params)
+        response.raise_for_status()
+
+        return response.json()
+
+    async def create_task(
+        self,
+        title: str,
+        description: str,
+        due_date: Union[str, datetime],
+        priority: str,
+        completed: bool = False,
+    ) -> Dict[str, Any]:
+
+        if isinstance(due_date, datetime):
+            due_date = due_date.isoformat()
+
+        task_data = {
+            "title": title,
+            "description": description,
+            "due_date": due_date,
+            "priority": priority,
+            "completed": completed,
+        }
+
+        return await self._make_request("POST", "/tasks", data=task_data)
+
+    async def get_tasks(
+        self, completed: Optional[bool] = None, priority: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+
+        params = {}
+        if completed is not None:
+            params["completed"] = completed
+        if priority is not None:
+            params["priority"] = priority
+
+        response = await self._make_request("GET", "/tasks", params=params)
+
+        return response.get("tasks", [])
+
+    async def get_tasks_page(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+
+        params = {}
+        if completed is not None:
+            params["completed"] = completed
+        if priority is not None:
+            params["priority"] = priority
+        if limit is not None:
+            params["limit"] = limit
+        if cursor is not None:
+            params["cursor"] = cursor
+        if order_by is not None:
+            params["order_by"] = order_by
+
+        return await self._make_request("GET", "/tasks", params=params)
+
+    async def iter_tasks(
+        self,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        page_size: int = 100,
+        order_by: str = "id",
+    ) -> AsyncIterator[Dict[str, Any]]:
+
+        cursor = None
+        while True:
+            page = await self.get_tasks_page(
+                completed=completed,
+                priority=priority,
+                limit=page_size,
+                cursor=cursor,
+                order_by=order_by,
+            )
+            for task in page.get("tasks", []):
+                yield task
+
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
+    async def stream_tasks(
+        self, completed: Optional[bool] = None, priority: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+
+        params = {}
+        if completed is not None:
+            params["completed"] = completed
+        if priority is not None:
+            params["priority"] = priority
+
+        async with self.client.stream(
+            "GET", "/tasks/stream", params=params
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def get_task(self, task_id: int) -> Dict[str, Any]:
+
+        return await self._make_request("GET", f"/tasks/{task_id}")
+
+    async def update_task(
+        self,
+        task_id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        due_date: Optional[Union[str, datetime]] = None,
+        priority: Optional[str] = None,
+        completed: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+
+        if isinstance(due_date, datetime):
+            due_date = due_date.isoformat()
+
+        update_data = {}
+        if title is not None:
+            update_data["title"] = title
+        if description is not None:
+            update_data["description"] = description
+        if due_date is not None:
+            update_data["due_date"] = due_date
+        if priority is not None:
+            update_data["priority"] = priority
+        if completed is not None:
+            update_data["completed"] = completed
+
+        return await self._make_request("PUT", f"/tasks/{task_id}", data=update_data)
+
+    async def delete_task(self, task_id: int) -> Dict[str, Any]:
+
+        return await self._make_request("DELETE", f"/tasks/{task_id}")
+
+    async def _post_chunks(
+        self, endpoint: str, key: str, items: List[Any]
+    ) -> List[Any]:
+
+        operations = [
+            functools.partial(self._make_request, "POST", endpoint, data={key: chunk})
+            for chunk in split_chunks(items, self.chunk_size)
+        ]
+        result = await fan_out(operations, concurrency=self.chunk_concurrency)
+        if result.errors:
+            raise result.errors[0][1]
+        return result.results
+
+    async def mark_tasks_complete(self, task_ids: List[int]) -> List[Dict[str, Any]]:
+
+        responses = await self._post_chunks("/tasks/complete", "task_ids", task_ids)
+        return merge_task_lists(responses)
+
+    async def mark_tasks_incomplete(self, task_ids: List[int]) -> List[Dict[str, Any]]:
+
+        responses = await self._post_chunks("/tasks/incomplete", "task_ids", task_ids)
+        return merge_task_lists(responses)
+
+    async def delete_tasks(self, task_ids: List[int]) -> Dict[str, Any]:
+
+        responses = await self._post_chunks("/tasks/delete", "task_ids", task_ids)
+        return merge_delete_results(responses)
+
+    async def create_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+        processed_tasks = []
+        for task in tasks:
+            processed_task = task.copy()
+            if isinstance(processed_task.get("due_date"), datetime):
+                processed_task["due_date"] = processed_task["due_date"].isoformat()
+            processed_tasks.append(processed_task)
+
+        responses = await self._post_chunks("/tasks/batch", "tasks", processed_tasks)
+        return merge_task_lists(responses)
+
+    async def update_priorities_by_due_date(
+        self, due_date: Union[str, datetime], priority: str
+    ) -> List[Dict[str, Any]]:
+
+        if isinstance(due_date, datetime):
+            due_date = due_date.isoformat()
+
+        tagger_data = {"due_date": due_date, "priority": priority}
+
+        return await self._make_request("POST", "/tagger", data=tagger_data)
+
+    async def retag_tasks(self) -> Dict[str, Any]:
+
+        return await self._make_request("POST", "/tasks/retag")
+
+    async def update_task_tag(self, task_id: int) -> Dict[str, Any]:
+
+        data = {"task_id": task_id}
+        return await self._make_request("POST", "/tagger", data=data)
+
+    async def create_tasks(
+        self, tasks: Iterable[Dict[str, Any]], concurrency: int = 64
+    ) -> FanOutResult:
+
+        operations = [
+            functools.partial(self.create_task, **task_fields(task)) for task in tasks
+        ]
+        return await fan_out(operations, concurrency=concurrency)
+
+    async def update_tasks(
+        self, updates: Iterable[Dict[str, Any]], concurrency: int = 64
+    ) -> FanOutResult:
+
+        operations = [
+            functools.partial(self.update_task, update["id"], **task_fields(update))
+            for update in updates
+        ]
+        return await fan_out(operations, concurrency=concurrency)
+
+
 def print_task(task: Dict[str, Any]) -> None:
 
     print(f"ID: {task['id']}")
@@ -180,6 +674,264 @@ def print_task(task: Dict[str, Any]) -> None:
     print()
 
 
+def read_tasks_file(file_path: str) -> List[Dict[str, Any]]:
+
+    if file_path == "-":
+        content = sys.stdin.read()
+    else:
+        with open(file_path, "r") as f:
+            content = f.read()
+
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    if isinstance(data, dict):
+        return data["tasks"] if "tasks" in data else [data]
+    return data
+
+
+async def import_tasks(
+    args: argparse.Namespace, tasks: List[Dict[str, Any]]
+) -> FanOutResult:
+
+    async with AsyncTaskManagerClient(
+        args.url,
+        pool_size=args.concurrency,
+        retries=args.retries,
+        timeout=args.timeout,
+    ) as client:
+        return await client.create_tasks(tasks, concurrency=args.concurrency)
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in BENCH_OPERATIONS:
+            raise ValueError(f"Invalid operation in mix: {name}")
+        try:
+            weights[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name}: {weight}")
+
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("Operation mix needs at least one positive weight")
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(
+    latencies: List[float], errors: int, elapsed: float
+) -> Dict[str, Any]:
+
+    count = len(latencies) + errors
+    summary = {
+        "requests": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+    }
+    for name, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+        summary[name] = percentile(latencies, fraction) * 1000 if latencies else None
+    return summary
+
+
+class LoadGenerator:
+
+    def __init__(
+        self,
+        client: AsyncTaskManagerClient,
+        mix: Dict[str, float],
+        duration: float,
+        concurrency: int = 16,
+        rate: Optional[float] = None,
+        bulk_size: int = 20,
+        seed: Optional[int] = None,
+    ):
+
+        self.client = client
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.duration = duration
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.bulk_size = bulk_size
+        self.random = random.Random(seed)
+        self.task_ids: List[int] = []
+        self.latencies: Dict[str, List[float]] = {name: [] for name in mix}
+        self.errors: Dict[str, int] = {name: 0 for name in mix}
+        self.error_samples: Dict[str, str] = {}
+
+    def _random_id(self) -> int:
+
+        return self.random.choice(self.task_ids)
+
+    async def _create(self) -> None:
+
+        task = await self.client.create_task(
+            title=f"Load test task {self.random.randrange(1000000)}",
+            description="Created by the client bench command",
+            due_date=datetime.now() + timedelta(days=self.random.randint(-3, 60)),
+            priority=self.random.choice(PRIORITIES),
+        )
+        self.task_ids.append(task["id"])
+
+    async def _read(self) -> None:
+
+        await self.client.get_task(self._random_id())
+
+    async def _filter(self) -> None:
+
+        await self.client.get_tasks_page(
+            completed=self.random.choice([None, True, False]),
+            priority=self.random.choice((None,) + PRIORITIES),
+            limit=100,
+        )
+
+    async def _update(self) -> None:
+
+        await self.client.update_task(
+            self._random_id(), priority=self.random.choice(PRIORITIES)
+        )
+
+    async def _bulk(self) -> None:
+
+        task_ids = self.random.sample(
+            self.task_ids, min(self.bulk_size, len(self.task_ids))
+        )
+        if self.random.random() < 0.5:
+            await self.client.mark_tasks_complete(task_ids)
+        else:
+            await self.client.mark_tasks_incomplete(task_ids)
+
+    async def _seed_task_ids(self) -> None:
+
+        page = await self.client.get_tasks_page(limit=1000)
+        self.task_ids = [task["id"] for task in page.get("tasks", [])]
+        while len(self.task_ids) < self.bulk_size:
+            await self._create()
+
+    async def _worker(self, start: float, deadline: float) -> None:
+
+        interval = self.concurrency / self.rate if self.rate else None
+        scheduled = start
+        while True:
+            if interval is not None:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+            if scheduled >= deadline:
+                return
+
+            name = self.random.choices(self.operations, self.weights)[0]
+            try:
+                await getattr(self, f"_{name}")()
+            except Exception as e:
+                self.errors[name] += 1
+                self.error_samples.setdefault(name, str(e).splitlines()[0])
+            else:
+                self.latencies[name].append(time.perf_counter() - scheduled)
+
+            if interval is not None:
+                scheduled += interval
+
+    async def run(self) -> Dict[str, Any]:
+
+        await self._seed_task_ids()
+
+        start = time.perf_counter()
+        deadline = start + self.duration
+        stagger = 1 / self.rate if self.rate else 0
+        await asyncio.gather(
+            *(
+                self._worker(start + index * stagger, deadline)
+                for index in range(self.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        operations = {
+            name: summarize_latencies(self.latencies[name], self.errors[name], elapsed)
+            for name in self.operations
+        }
+        total = summarize_latencies(
+            [value for name in self.operations for value in self.latencies[name]],
+            sum(self.errors.values()),
+            elapsed,
+        )
+        return {
+            "duration_s": elapsed,
+            "concurrency": self.concurrency,
+            "target_rate": self.rate,
+            "operations": operations,
+            "total": total,
+            "error_samples": self.error_samples,
+        }
+
+
+async def run_bench(args: argparse.Namespace) -> Dict[str, Any]:
+
+    async with AsyncTaskManagerClient(
+        args.url,
+        pool_size=args.concurrency,
+        retries=args.retries,
+        timeout=args.timeout,
+        chunk_size=args.chunk_size,
+        chunk_concurrency=args.chunk_concurrency,
+    ) as client:
+        generator = LoadGenerator(
+            client,
+            parse_mix(args.mix),
+            args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            bulk_size=args.bulk_size,
+            seed=args.seed,
+        )
+        return await generator.run()
+
+
+def print_bench_report(report: Dict[str, Any]) -> None:
+
+    def milliseconds(value: Optional[float]) -> str:
+
+        return "-" if value is None else f"{value:.1f}"
+
+    target = ""
+    if report["target_rate"]:
+        target = f", target {report['target_rate']:g} req/s"
+    print(
+        f"Ran {report['duration_s']:.1f}s with {report['concurrency']} workers{target}"
+    )
+    print(
+        f"{'operation':<10} {'requests':>9} {'req/s':>9} {'errors':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+
+    rows = list(report["operations"].items()) + [("total", report["total"])]
+    for name, summary in rows:
+        print(
+            f"{name:<10} {summary['requests']:>9} {summary['throughput_rps']:>9.1f} "
+            f"{summary['error_rate']:>7.1%} {milliseconds(summary['p50_ms']):>9} "
+            f"{milliseconds(summary['p95_ms']):>9} {milliseconds(summary['p99_ms']):>9}"
+        )
+
+    for name, message in report["error_samples"].items():
+        print(f"First {name} error: {message}")
+
+
 def main():
 
     parser = argparse.ArgumentParser(description="Smart Task Manager Client")
@@ -187,6 +939,27 @@ def main():
     parser.add_argument(
         "--url", default="http://localhost:8000", help="Base URL of the API"
     )
+    parser.add_argument(
+        "--pool-size", type=int, default=10, help="Maximum pooled connections"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=3, help="Retries for failed requests"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10, help="Request timeout in seconds"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Maximum IDs or tasks sent per bulk request",
+    )
+    parser.add_argument(
+        "--chunk-concurrency",
+        type=int,
+        default=1,
+        help="Bulk request chunks sent concurrently",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
@@ -217,6 +990,68 @@ def main():
         choices=["Low", "Medium", "High"],
         help="Filter for tasks with specific priority",
     )
+    list_parser.add_argument(
+        "--page-size",
+        type=int,
+        help="Fetch tasks lazily in pages of this size",
+    )
+    list_parser.add_argument(
+        "--order-by",
+        choices=["id", "due_date"],
+        default="id",
+        help="Ordering used when paging through tasks",
+    )
+
+    export_parser = subparsers.add_parser(
+        "export", help="Stream tasks to stdout as newline-delimited JSON"
+    )
+    export_parser.add_argument(
+        "--completed",
+        choices=["true", "false"],
+        help="Filter for completed/incomplete tasks",
+    )
+    export_parser.add_argument(
+        "--priority",
+        choices=["Low", "Medium", "High"],
+        help="Filter for tasks with specific priority",
+    )
+
+    import_parser = subparsers.add_parser(
+        "import", help="Create tasks from a JSON or NDJSON file in parallel"
+    )
+    import_parser.add_argument(
+        "file", help="JSON list, {\"tasks\": [...]} or NDJSON file ('-' for stdin)"
+    )
+    import_parser.add_argument(
+        "--concurrency", type=int, default=64, help="Maximum requests in flight"
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Generate load against the API and report latencies"
+    )
+    bench_parser.add_argument(
+        "--duration", type=float, default=30, help="Seconds to generate load for"
+    )
+    bench_parser.add_argument(
+        "--concurrency", type=int, default=16, help="Concurrent workers"
+    )
+    bench_parser.add_argument(
+        "--rate",
+        type=float,
+        help="Target requests per second across all workers (default: unthrottled)",
+    )
+    bench_parser.add_argument(
+        "--mix",
+        default=DEFAULT_BENCH_MIX,
+        help=f"Operation weights from {', '.join(BENCH_OPERATIONS)}",
+    )
+    bench_parser.add_argument(
+        "--bulk-size", type=int, default=20, help="Task IDs per bulk operation"
+    )
+    bench_parser.add_argument("--seed", type=int, help="Random seed for the mix")
+    bench_parser.add_argument(
+        "--json", action="store_true", help="Print the report as JSON"
+    )
 
     get_parser = subparsers.add_parser("get", help="Get a task by ID")
     get_parser.add_argument("id", type=int, help="Task ID")
@@ -268,9 +1103,20 @@ def main():
     )
     update_tag_parser.add_argument("id", type=int, help="Task ID")
 
+    subparsers.add_parser(
+        "retag", help="Recompute the tags of all tasks from their due dates"
+    )
+
     args = parser.parse_args()
 
-    client = TaskManagerClient(args.url)
+    client = TaskManagerClient(
+        args.url,
+        pool_size=args.pool_size,
+        retries=args.retries,
+        timeout=args.timeout,
+        chunk_size=args.chunk_size,
+        chunk_concurrency=args.chunk_concurrency,
+    )
 
     try:
         if args.command == "create":
@@ -296,11 +1142,37 @@ def main():
             elif args.completed == "false":
                 completed = False
 
-            tasks = client.get_tasks(completed=completed, priority=args.priority)
+            if args.page_size:
+                count = 0
+                for task in client.iter_tasks(
+                    completed=completed,
+                    priority=args.priority,
+                    page_size=args.page_size,
+                    order_by=args.order_by,
+                ):
+                    print_task(task)
+                    count += 1
+
+                print(f"Found {count} tasks")
+            else:
+                tasks = client.get_tasks(completed=completed, priority=args.priority)
 
-            print(f"Found {len(tasks)} tasks:")
-            for task in tasks:
-                print_task(task)
+                print(f"Found {len(tasks)} tasks:")
+                for task in tasks:
+                    print_task(task)
+
+        elif args.command == "export":
+
+            completed = None
+            if args.completed == "true":
+                completed = True
+            elif args.completed == "false":
+                completed = False
+
+            for task in client.stream_tasks(
+                completed=completed, priority=args.priority
+            ):
+                print(json.dumps(task))
 
         elif args.command == "get":
 
@@ -380,15 +1252,42 @@ def main():
             print("Task updated successfully:")
             print_task(task)
 
+        elif args.command == "retag":
+
+            result = client.retag_tasks()
+
+            print(result["message"])
+
+        elif args.command == "import":
+
+            tasks = read_tasks_file(args.file)
+
+            result = asyncio.run(import_tasks(args, tasks))
+
+            print(f"Imported {result.succeeded} of {len(tasks)} tasks")
+            for index, error in result.errors[:10]:
+                print(f"Task {index}: {str(error).splitlines()[0]}")
+            if result.errors:
+                sys.exit(1)
+
+        elif args.command == "bench":
+
+            report = asyncio.run(run_bench(args))
+
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                print_bench_report(report)
+
         else:
             print("Please specify a command.")
             parser.print_help()
             sys.exit(1)
 
-    except RequestException as e:
+    except REQUEST_ERRORS as e:
         print(f"Error: {e}")
         sys.exit(1)
-    except ValueError as e:
+    except (ValueError, OSError, RuntimeError) as e:
         print(f"Error: {e}")
         sys.exit(1)
 
@@ -48,8 +48,13 @@ class TaskApiService {
     }
   }
 
-  async getTasks(completed = null, priority = null) {
-    const params = { completed, priority };
+  async getTasks(
+    completed = null,
+    priority = null,
+    limit = null,
+    cursor = null
+  ) {
+    const params = { completed, priority, limit, cursor };
     const response = await this.makeRequest("/tasks", "GET", null, params);
     return response;
   }
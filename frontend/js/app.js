@@ -22,11 +22,15 @@ document.addEventListener("DOMContentLoaded", () => {
   const priorityFilter = document.getElementById("priority-filter");
   const applyFiltersBtn = document.getElementById("apply-filters-btn");
   const clearFiltersBtn = document.getElementById("clear-filters-btn");
+  const loadMoreBtn = document.getElementById("load-more-btn");
 
   const closeButtons = document.querySelectorAll(".close");
 
+  const PAGE_SIZE = 50;
+
   let currentTasks = [];
   let selectedTaskIds = [];
+  let nextCursor = null;
   let filters = {
     completed: null,
     priority: null,
@@ -48,14 +52,9 @@ document.addEventListener("DOMContentLoaded", () => {
             `;
       tasksContainer.appendChild(emptyState);
 
-      const response = await api.getTasks(filters.completed, filters.priority);
-      currentTasks = response.tasks || [];
-
-      currentTasks.forEach((task) => {
-        TaskUI.addTaskToContainer(task, tasksContainer);
-      });
-
-      TaskUI.toggleEmptyState(tasksContainer);
+      currentTasks = [];
+      nextCursor = null;
+      await loadNextPage();
 
       selectedTaskIds = [];
       TaskUI.updateSelectionUI(selectedTaskIds);
@@ -65,6 +64,38 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  async function loadNextPage() {
+    const response = await api.getTasks(
+      filters.completed,
+      filters.priority,
+      PAGE_SIZE,
+      nextCursor
+    );
+    const tasks = response.tasks || [];
+
+    tasks.forEach((task) => {
+      TaskUI.addTaskToContainer(task, tasksContainer);
+    });
+    currentTasks = currentTasks.concat(tasks);
+
+    nextCursor = response.next_cursor || null;
+    loadMoreBtn.style.display = nextCursor ? "block" : "none";
+
+    TaskUI.toggleEmptyState(tasksContainer);
+  }
+
+  async function loadMoreTasks() {
+    try {
+      loadMoreBtn.disabled = true;
+      await loadNextPage();
+      selectAllCheckbox.checked = false;
+    } catch (error) {
+      TaskUI.showToast(error.message, "error");
+    } finally {
+      loadMoreBtn.disabled = false;
+    }
+  }
+
   async function saveTask(event) {
     event.preventDefault();
 
@@ -392,6 +423,8 @@ document.addEventListener("DOMContentLoaded", () => {
   bulkIncompleteBtn.addEventListener("click", markSelectedTasksIncomplete);
   bulkDeleteBtn.addEventListener("click", deleteSelectedTasks);
 
+  loadMoreBtn.addEventListener("click", loadMoreTasks);
+
   applyFiltersBtn.addEventListener("click", applyFilters);
   clearFiltersBtn.addEventListener("click", clearFilters);
 
@@ -0,0 +1,5 @@
+"""
+Task tag service package.
+
+This package provides the tag rules shared by the tag server and the main API.
+"""
@@ -1,15 +1,79 @@
+import os
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
+try:
+    from tag_server.metrics import (
+        CONTENT_TYPE,
+        Counter,
+        Gauge,
+        Histogram,
+        MetricsMiddleware,
+        MetricsRegistry,
+    )
+    from tag_server.rules import TagCache
+except ImportError:
+    from metrics import (
+        CONTENT_TYPE,
+        Counter,
+        Gauge,
+        Histogram,
+        MetricsMiddleware,
+        MetricsRegistry,
+    )
+    from rules import TagCache
+
 app = FastAPI(
     title="Task Tag Service",
     description="Service for generating tags for tasks based on due date and priority",
     version="1.0.0",
 )
 
+tag_cache = TagCache(max_size=int(os.environ.get("TAG_CACHE_SIZE", "4096")))
+
+registry = MetricsRegistry()
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "tag_server_request_duration_seconds",
+        "HTTP request latency by route",
+        ("method", "route", "status"),
+    )
+)
+registry.register(
+    Counter(
+        "tag_server_tag_cache_hits_total",
+        "Tag cache lookups answered from the cache",
+        callback=lambda: tag_cache.stats()["hits"],
+    )
+)
+registry.register(
+    Counter(
+        "tag_server_tag_cache_misses_total",
+        "Tag cache lookups that missed the cache",
+        callback=lambda: tag_cache.stats()["misses"],
+    )
+)
+registry.register(
+    Gauge(
+        "tag_server_tag_cache_hit_ratio",
+        "Fraction of tag cache lookups answered from the cache",
+        callback=lambda: tag_cache.stats()["hit_ratio"],
+    )
+)
+registry.register(
+    Gauge(
+        "tag_server_tag_cache_size",
+        "Entries held in the tag cache",
+        callback=lambda: tag_cache.stats()["size"],
+    )
+)
+
+app.add_middleware(MetricsMiddleware, histogram=REQUEST_LATENCY)
+
 
 class TaskTagRequest(BaseModel):
 
@@ -24,73 +88,57 @@ class TaskTagResponse(BaseModel):
     tag: str = Field(..., description="Generated tag for the task")
 
 
-def calculate_time_difference(due_date: datetime) -> int:
-
-    now = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    due = due_date.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    days_remaining = (due - now).days
-
-    return days_remaining
+class TaskTagBatchRequest(BaseModel):
 
+    tasks: List[TaskTagRequest] = Field(..., description="Tasks to generate tags for")
 
-def generate_tag(due_date: datetime, priority: str) -> str:
 
-    if priority not in ["Low", "Medium", "High"]:
-        raise ValueError(
-            f"Invalid priority: {priority}. Must be one of: Low, Medium, High"
-        )
+class TaskTagBatchResponse(BaseModel):
 
-    days_remaining = calculate_time_difference(due_date)
+    tags: List[str] = Field(..., description="Generated tags, in request order")
 
-    if days_remaining < 0:
 
-        base_tag = "Overdue"
-    elif days_remaining < 1:
-
-        base_tag = "Urgent"
-    elif days_remaining <= 7:
-
-        base_tag = "High priority"
-    elif days_remaining <= 28:
+@app.get("/", tags=["Root"])
+async def root():
 
-        base_tag = "Medium"
-    else:
+    return {"message": "Welcome to the Task Tag Service!"}
 
-        base_tag = "Low priority"
 
-    final_tag = base_tag
+@app.post("/tag", response_model=TaskTagResponse, tags=["Tags"])
+async def get_task_tag(request: TaskTagRequest):
 
-    if base_tag == "Overdue":
+    try:
 
-        final_tag = "Overdue"
-    elif priority == "High" and (base_tag == "Medium" or base_tag == "Low priority"):
+        tag = tag_cache.get_or_generate(request.due_date, request.priority)
 
-        final_tag = "High priority"
-    elif priority == "Low" and base_tag == "High priority" and days_remaining > 3:
+        return TaskTagResponse(tag=tag)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        final_tag = "Medium"
 
-    return final_tag
+@app.post("/tag/batch", response_model=TaskTagBatchResponse, tags=["Tags"])
+async def get_task_tags(request: TaskTagBatchRequest):
 
+    tags = []
+    for index, task in enumerate(request.tasks):
+        try:
+            tags.append(tag_cache.get_or_generate(task.due_date, task.priority))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Task {index}: {e}")
 
-@app.get("/", tags=["Root"])
-async def root():
+    return TaskTagBatchResponse(tags=tags)
 
-    return {"message": "Welcome to the Task Tag Service!"}
 
+@app.get("/metrics", tags=["Monitoring"])
+async def metrics():
 
-@app.post("/tag", response_model=TaskTagResponse, tags=["Tags"])
-async def get_task_tag(request: TaskTagRequest):
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
 
-    try:
 
-        tag = generate_tag(request.due_date, request.priority)
+@app.get("/tag/cache", tags=["Tags"])
+async def get_tag_cache_stats():
 
-        return TaskTagResponse(tag=tag)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return tag_cache.stats()
 
 
 if __name__ == "__main__":
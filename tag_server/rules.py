@@ -0,0 +1,175 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PRIORITY_NAMES = ["Low", "Medium", "High"]
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITY_NAMES)}
+TAG_NAMES = ["Overdue", "Urgent", "High priority", "Medium", "Low priority"]
+
+
+def calculate_time_difference(due_date: datetime) -> int:
+
+    now = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    due = due_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    days_remaining = (due - now).days
+
+    return days_remaining
+
+
+def generate_tag(due_date: datetime, priority: str) -> str:
+
+    if priority not in PRIORITY_CODES:
+        raise ValueError(
+            f"Invalid priority: {priority}. Must be one of: Low, Medium, High"
+        )
+
+    days_remaining = calculate_time_difference(due_date)
+
+    return tag_for_days_remaining(days_remaining, priority)
+
+
+def tag_for_days_remaining(days_remaining: int, priority: str) -> str:
+
+    if days_remaining < 0:
+
+        base_tag = "Overdue"
+    elif days_remaining < 1:
+
+        base_tag = "Urgent"
+    elif days_remaining <= 7:
+
+        base_tag = "High priority"
+    elif days_remaining <= 28:
+
+        base_tag = "Medium"
+    else:
+
+        base_tag = "Low priority"
+
+    final_tag = base_tag
+
+    if base_tag == "Overdue":
+
+        final_tag = "Overdue"
+    elif priority == "High" and (base_tag == "Medium" or base_tag == "Low priority"):
+
+        final_tag = "High priority"
+    elif priority == "Low" and base_tag == "High priority" and days_remaining > 3:
+
+        final_tag = "Medium"
+
+    return final_tag
+
+
+def generate_tag_codes(days_remaining, priority_codes):
+
+    tag_codes = np.select(
+        [days_remaining < 0, days_remaining < 1, days_remaining <= 7],
+        [0, 1, 2],
+        np.where(days_remaining <= 28, 3, 4),
+    )
+
+    high = priority_codes == PRIORITY_CODES["High"]
+    tag_codes[high & (tag_codes >= 3)] = 2
+
+    low = priority_codes == PRIORITY_CODES["Low"]
+    tag_codes[low & (tag_codes == 2) & (days_remaining > 3)] = 3
+
+    return tag_codes
+
+
+def generate_tags(
+    days_remaining: Sequence[int], priorities: Sequence[str]
+) -> List[str]:
+
+    for priority in set(priorities):
+        if priority not in PRIORITY_CODES:
+            raise ValueError(
+                f"Invalid priority: {priority}. Must be one of: Low, Medium, High"
+            )
+
+    if np is None:
+        return [
+            tag_for_days_remaining(days, priority)
+            for days, priority in zip(days_remaining, priorities)
+        ]
+
+    tag_codes = generate_tag_codes(
+        np.asarray(days_remaining, dtype=np.int64),
+        np.array([PRIORITY_CODES[priority] for priority in priorities], dtype=np.int8),
+    )
+    return np.array(TAG_NAMES, dtype=object)[tag_codes].tolist()
+
+
+class TagCache:
+
+    def __init__(self, max_size: int = 4096):
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[date, Any, str], str]" = OrderedDict()
+        self._day: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def key(self, due_date: datetime, priority: str) -> Tuple[date, Any, str]:
+
+        return (due_date.date(), due_date.tzinfo, priority)
+
+    def _roll_over(self) -> None:
+
+        today = datetime.now().date()
+        if today != self._day:
+            self._entries.clear()
+            self._day = today
+
+    def get(self, due_date: datetime, priority: str) -> Optional[str]:
+
+        key = self.key(due_date, priority)
+        with self._lock:
+            self._roll_over()
+            tag = self._entries.get(key)
+            if tag is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return tag
+
+    def put(self, due_date: datetime, priority: str, tag: str) -> None:
+
+        key = self.key(due_date, priority)
+        with self._lock:
+            self._roll_over()
+            self._entries[key] = tag
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_generate(self, due_date: datetime, priority: str) -> str:
+
+        tag = self.get(due_date, priority)
+        if tag is None:
+            tag = generate_tag(due_date, priority)
+            self.put(due_date, priority, tag)
+        return tag
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
@@ -0,0 +1,50 @@
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+import app.models
+from app.models import Priority, Task, TaskManager
+
+
+def make_tasks(
+    count: int, seed: int = 7, completed_rate: float = 0.3, days: int = 60
+) -> List[Task]:
+
+    rng = random.Random(seed)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=days)
+    tags = [None, "Overdue", "Urgent", "High priority", "Medium", "Low priority"]
+
+    return [
+        Task(
+            task_id=task_id,
+            title=f"Task {task_id}",
+            description=f"Test task {task_id}",
+            due_date=start + timedelta(minutes=rng.randrange(2 * days * 24 * 60)),
+            priority=rng.choice(list(Priority)),
+            completed=rng.random() < completed_rate,
+            tag=rng.choice(tags),
+        )
+        for task_id in range(1, count + 1)
+    ]
+
+
+@pytest.fixture(params=[False, True], ids=["sets", "vector"])
+def build_task_manager(request, monkeypatch):
+
+    if request.param:
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(app.models, "VECTOR_INDEX_THRESHOLD", 1)
+    else:
+        monkeypatch.setattr(app.models, "VECTOR_INDEX_THRESHOLD", float("inf"))
+
+    def build(tasks: List[Task]) -> TaskManager:
+
+        task_manager = TaskManager()
+        task_manager.insert_tasks(tasks)
+        task_manager.next_id = len(tasks) + 1
+        assert (task_manager._vector_index is not None) == request.param
+        return task_manager
+
+    return build
@@ -0,0 +1,67 @@
+import pytest
+
+from app.models import Priority, TaskOrder, page_entry
+from tests.conftest import make_tasks
+
+
+def walk_pages(task_manager, completed, priority, order_by, limit):
+
+    ids, after = [], None
+    while True:
+        page, after = task_manager.page_tasks(
+            completed=completed,
+            priority=priority,
+            order_by=order_by,
+            after=after,
+            limit=limit,
+        )
+        ids.extend(task.id for task in page)
+        if after is None:
+            return ids
+        assert len(page) == limit
+
+
+def brute_force(tasks, completed, priority, order_by):
+
+    matches = [
+        task
+        for task in tasks
+        if (completed is None or task.completed == completed)
+        and (priority is None or task.priority == priority)
+    ]
+    return [task.id for task in sorted(matches, key=lambda t: page_entry(t, order_by))]
+
+
+@pytest.mark.parametrize("order_by", list(TaskOrder))
+@pytest.mark.parametrize("completed", [None, True, False])
+@pytest.mark.parametrize("priority", [None, Priority.HIGH])
+@pytest.mark.parametrize("completed_rate", [0.02, 0.5])
+def test_pages_match_brute_force_ordering(
+    build_task_manager, order_by, completed, priority, completed_rate
+):
+
+    tasks = make_tasks(1500, completed_rate=completed_rate)
+    task_manager = build_task_manager(tasks)
+    expected = brute_force(tasks, completed, priority, order_by)
+
+    for limit in (1, 7, 100, None):
+        ids = walk_pages(task_manager, completed, priority, order_by, limit)
+        assert ids == expected
+
+
+@pytest.mark.parametrize("order_by", list(TaskOrder))
+def test_pages_follow_updates_and_deletes(build_task_manager, order_by):
+
+    tasks = make_tasks(600)
+    task_manager = build_task_manager(tasks)
+
+    for task in tasks[::5]:
+        task_manager.update_task(task.id, due_date=tasks[-1].due_date)
+    task_manager.mark_tasks_complete([task.id for task in tasks[::3]])
+    task_manager.delete_tasks([task.id for task in tasks[::7]])
+
+    remaining = task_manager.list_tasks()
+    for completed in (None, True, False):
+        expected = brute_force(remaining, completed, Priority.LOW, order_by)
+        ids = walk_pages(task_manager, completed, Priority.LOW, order_by, 9)
+        assert ids == expected
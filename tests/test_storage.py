@@ -0,0 +1,74 @@
+import os
+from datetime import datetime
+
+from app.models import Priority
+from app.storage import JournalStorage, SQLiteStorage, import_json_to_sqlite
+from app.utils import load_tasks_from_file, save_tasks_to_file
+from tests.conftest import make_tasks
+
+
+def snapshot(task_manager):
+
+    return [task.to_dict() for task in task_manager.list_tasks()]
+
+
+def test_journal_replays_changes_after_compaction(tmp_path):
+
+    tasks_file = str(tmp_path / "tasks.json")
+    storage = JournalStorage(tasks_file, compact_threshold=10)
+    task_manager = storage.load()
+
+    for task in make_tasks(12):
+        task_manager.add_task(
+            task.title, task.description, task.due_date, task.priority, tag=task.tag
+        )
+        storage.save(task_manager)
+    assert os.path.exists(tasks_file)
+    assert storage._journal_records == 2
+
+    task_manager.update_task(2, title="Renamed", priority=Priority.HIGH)
+    task_manager.mark_tasks_complete([3, 4])
+    task_manager.delete_tasks([1, 5])
+    task_manager.add_task(
+        "Late", "Added after compaction", datetime(2030, 1, 1), Priority.LOW
+    )
+    storage.save(task_manager)
+    storage.sync()
+    assert storage._journal_records == 8
+
+    reloaded = JournalStorage(tasks_file).load()
+    assert snapshot(reloaded) == snapshot(task_manager)
+    assert reloaded.next_id == task_manager.next_id == 14
+    assert reloaded.get_task(2).title == "Renamed"
+    assert reloaded.get_task(1) is None
+
+    storage.close()
+    assert os.path.getsize(storage.journal_path) == 0
+    assert snapshot(JournalStorage(tasks_file).load()) == snapshot(task_manager)
+
+
+def test_sqlite_import_preserves_next_id(tmp_path):
+
+    json_path = str(tmp_path / "tasks.json")
+    db_path = str(tmp_path / "tasks.db")
+
+    source = load_tasks_from_file(json_path)
+    source.insert_tasks(make_tasks(20))
+    source.next_id = 21
+    source.delete_tasks([18, 19, 20])
+    save_tasks_to_file(source, json_path)
+
+    assert import_json_to_sqlite(json_path, db_path) == 17
+
+    storage = SQLiteStorage(db_path)
+    try:
+        task_manager = storage.load()
+        assert task_manager.next_id == 21
+        assert snapshot(task_manager) == snapshot(source)
+
+        task = task_manager.add_task(
+            "New", "After import", datetime(2030, 1, 1), Priority.MEDIUM
+        )
+        assert task.id == 21
+    finally:
+        storage.close()
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from app.utils import retag_tasks, roll_over_tags
+from tag_server.rules import generate_tag
+from tests.conftest import make_tasks
+
+
+def scalar_tags(task_manager):
+
+    return {
+        task.id: generate_tag(task.due_date, task.priority.value)
+        for task in task_manager.list_tasks()
+    }
+
+
+def current_tags(task_manager):
+
+    return {task.id: task.tag for task in task_manager.list_tasks()}
+
+
+def test_stale_tags_match_generate_tag(build_task_manager):
+
+    task_manager = build_task_manager(make_tasks(2000))
+    today = datetime.now().date()
+    expected = scalar_tags(task_manager)
+
+    stale = dict(task_manager.stale_tags(today))
+    assert stale == {
+        task.id: expected[task.id]
+        for task in task_manager.list_tasks()
+        if task.tag != expected[task.id]
+    }
+
+    assert retag_tasks(task_manager, today) == len(stale)
+    assert current_tags(task_manager) == expected
+    assert task_manager.stale_tags(today) == []
+
+
+def test_rollover_matches_full_retag(build_task_manager):
+
+    task_manager = build_task_manager(make_tasks(2000))
+    today = datetime.now().date()
+
+    retag_tasks(task_manager, today - timedelta(days=1))
+    roll_over_tags(task_manager, today)
+
+    assert current_tags(task_manager) == scalar_tags(task_manager)
+    assert task_manager.stale_tags(today) == []